@@ -1,261 +1,311 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields
 from typing import List, Optional, Any
 
-@dataclass
+def ast_node(cls):
+    """@dataclass that also gives the class __slots__ for the fields it adds.
+
+    Nodes then carry no per-instance __dict__. Every node class must use
+    this (not plain @dataclass), or its instances get a __dict__ back.
+    """
+    cls = dataclass(cls)
+    inherited = set()
+    for base in cls.__mro__[1:]:
+        inherited.update(getattr(base, '__dataclass_fields__', ()))
+    own = tuple(f.name for f in fields(cls) if f.name not in inherited)
+    namespace = dict(cls.__dict__)
+    for name in own:
+        namespace.pop(name, None)  # Defaults live on the generated __init__
+    namespace.pop('__dict__', None)
+    namespace.pop('__weakref__', None)
+    namespace['__slots__'] = own
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+def cache_slot():
+    """Field for state the interpreter caches on a node (None until filled).
+
+    Kept out of __init__'s parameters, repr and equality. The factory sets
+    the slot in __init__, since a slot cannot fall back to a class default.
+    """
+    return field(default_factory=type(None), init=False, repr=False, compare=False)
+
+@ast_node
 class ASTNode:
     pass
 
-@dataclass
+@ast_node
 class Program(ASTNode):
     declarations: List['Declaration']
     blocks: List['Block']
     main: 'MainBlock'
 
-@dataclass
+@ast_node
 class Declaration(ASTNode):
-    pass
+    _src_hash: Optional[str] = cache_slot()  # Source hash, set by hot reload
 
-@dataclass
+@ast_node
 class VarDeclaration(Declaration):
     name: str
     value: 'Expression'
 
-@dataclass
+@ast_node
 class Parameter(ASTNode):
     name: str
     default: Optional['Expression'] = None
 
-@dataclass
+@ast_node
 class FuncDeclaration(Declaration):
     name: str
     params: List['Parameter']
     body: List['Statement']
+    _code: Any = cache_slot()  # Compiled body, built on first run
+    _signature: Any = cache_slot()  # (parameter names, required count)
 
-@dataclass
+@ast_node
 class ImportDeclaration(Declaration):
     module: str
     alias: Optional[str] = None
 
-@dataclass
+@ast_node
 class FromImportDeclaration(Declaration):
     module: str
     names: List[str]
     aliases: List[Optional[str]]
 
-@dataclass
+@ast_node
 class ClassDeclaration(Declaration):
     name: str
     base_class: Optional[str]
     methods: List['FuncDeclaration']
     attributes: List['VarDeclaration']
 
-@dataclass
+@ast_node
 class Block(ASTNode):
     name: str
     body: List['Statement']
+    _code: Any = cache_slot()  # Compiled body, built on first run
+    _src_hash: Optional[str] = cache_slot()  # Source hash, set by hot reload
 
-@dataclass
+@ast_node
 class OSBlock(Block):
     pass
 
-@dataclass
+@ast_node
 class DEBlock(Block):
     iterations: int
+    tick: Optional[float] = None  # Delay between parallel iterations (seconds)
+    process: bool = False  # Run a parallel numeric body in a worker process
 
-@dataclass
+@ast_node
 class FOBlock(Block):
-    pass
+    tick: Optional[float] = None  # Delay between parallel iterations (seconds)
 
-@dataclass
+@ast_node
 class ParallelFOBlock(FOBlock):
     pass
 
-@dataclass
+@ast_node
 class ParallelDEBlock(DEBlock):
     pass
 
-@dataclass
+@ast_node
 class MainBlock(Block):
     pass
 
-@dataclass
+@ast_node
 class Statement(ASTNode):
     pass
 
-@dataclass
+@ast_node
 class ExpressionStatement(Statement):
     expr: 'Expression'
 
-@dataclass
+@ast_node
 class WhenStatement(Statement):
     condition: 'Expression'
     body: List[Statement]
+    _code: Any = cache_slot()  # Compiled body, built on first run
 
-@dataclass
+@ast_node
 class WithStatement(Statement):
     context_expr: 'Expression'
     var_name: Optional[str]
     body: List[Statement]
+    _code: Any = cache_slot()  # Compiled body, built on first run
 
-@dataclass
+@ast_node
 class BreakStatement(Statement):
     pass
 
-@dataclass
+@ast_node
 class ContinueStatement(Statement):
     pass
 
-@dataclass
+@ast_node
 class ExitStatement(Statement):
     pass
 
-@dataclass
+@ast_node
 class PassStatement(Statement):
     pass
 
-@dataclass
+@ast_node
 class ReturnStatement(Statement):
     values: List['Expression']
 
-@dataclass
+@ast_node
 class GlobalStatement(Statement):
     names: List[str]
 
-@dataclass
+@ast_node
 class Assignment(Statement):
     name: str
     value: 'Expression'
 
-@dataclass
+@ast_node
 class TupleUnpackingAssignment(Statement):
     targets: List[str]
     value: 'Expression'
+    _src_hash: Optional[str] = cache_slot()  # Set by hot reload at top level
 
-@dataclass
+@ast_node
 class IndexAssignment(Statement):
     object: 'Expression'
     index: 'Expression'
     value: 'Expression'
 
-@dataclass
+@ast_node
 class AttributeAssignment(Statement):
     object: 'Expression'
     attribute: str
     value: 'Expression'
 
-@dataclass
+@ast_node
 class Expression(ASTNode):
     pass
 
-@dataclass
+@ast_node
 class BinaryOp(Expression):
     left: Expression
     operator: str
     right: Expression
+    _op_fn: Any = cache_slot()  # Operator function, resolved ahead of time
 
-@dataclass
+@ast_node
 class UnaryOp(Expression):
     operator: str
     operand: Expression
+    _op_fn: Any = cache_slot()  # Operator function, resolved ahead of time
 
-@dataclass
+@ast_node
 class TernaryOp(Expression):
     true_expr: Expression
     condition: Expression
     false_expr: Expression
 
-@dataclass
+@ast_node
 class CallExpression(Expression):
     name: str
     args: List[Expression]
     kwargs: List['KeywordArg'] = None
+    _builtin: Optional[bool] = cache_slot()  # Whether name is a builtin
 
-@dataclass
+@ast_node
 class KeywordArg(ASTNode):
     name: str
     value: Expression
 
-@dataclass
+@ast_node
 class StartExpression(Expression):
     block_name: str
 
-@dataclass
+@ast_node
 class StopExpression(Expression):
     block_name: str
 
-@dataclass
+@ast_node
 class SaveExpression(Expression):
     block_name: str
 
-@dataclass
+@ast_node
 class SaveStopExpression(Expression):
     block_name: str
 
-@dataclass
+@ast_node
 class StartSaveExpression(Expression):
     block_name: str
 
-@dataclass
+@ast_node
 class DiscardExpression(Expression):
     block_name: str
 
-@dataclass
+@ast_node
 class Identifier(Expression):
     name: str
 
-@dataclass
+@ast_node
 class NumberLiteral(Expression):
     value: float
 
-@dataclass
+@ast_node
 class StringLiteral(Expression):
     value: str
 
-@dataclass
+@ast_node
 class FStringLiteral(Expression):
     parts: List[tuple]  # List of ('str', value) or ('expr', expression_string)
 
-@dataclass
+@ast_node
 class BooleanLiteral(Expression):
     value: bool
 
-@dataclass
+@ast_node
 class NoneLiteral(Expression):
     pass
 
-@dataclass
+@ast_node
 class ListLiteral(Expression):
     elements: List[Expression]
 
-@dataclass
+@ast_node
 class TupleLiteral(Expression):
     elements: List[Expression]
 
-@dataclass
+@ast_node
 class DictLiteral(Expression):
     keys: List[Expression]
     values: List[Expression]
 
-@dataclass
+@ast_node
 class IndexExpression(Expression):
     object: Expression
     index: Expression
 
-@dataclass
+@ast_node
 class SliceExpression(Expression):
     object: Expression
     start: Optional[Expression]
     stop: Optional[Expression]
     step: Optional[Expression] = None
 
-@dataclass
+@ast_node
 class MemberAccess(Expression):
     object: Expression
     member: str
 
-@dataclass
+@ast_node
 class MethodCall(Expression):
     object: Expression
     method: str
     args: List[Expression]
-    kwargs: List['KeywordArg'] = None
\ No newline at end of file
+    kwargs: List['KeywordArg'] = None
+    # Inline cache of the call site: object type and its method
+    _cached_type: Any = cache_slot()
+    _cached_func: Any = cache_slot()
+
+# Nodes with no fields carry no state, so the parser shares one instance
+# of each instead of building a new node per occurrence
+BREAK_STATEMENT = BreakStatement()
+CONTINUE_STATEMENT = ContinueStatement()
+EXIT_STATEMENT = ExitStatement()
+PASS_STATEMENT = PassStatement()
+NONE_LITERAL = NoneLiteral()
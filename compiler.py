@@ -0,0 +1,381 @@
+"""
+Compiler for WHEN Language
+Lowers statement lists to flat code tuples that the interpreter runs
+without going through execute_statement for every statement
+"""
+
+import operator
+from dataclasses import fields
+from typing import Any, Callable, Collection, List, Optional, Tuple
+from ast_nodes import (
+    ASTNode, Statement, WhenStatement, BinaryOp, UnaryOp, TernaryOp,
+    CallExpression, Identifier, MemberAccess, NumberLiteral, StringLiteral,
+    BooleanLiteral, NoneLiteral, ListLiteral, TupleLiteral, DictLiteral,
+    Assignment, PassStatement
+)
+
+# Optional: native compilation of numeric kernels (when --jit)
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# A compiled body: (handler, statement) pairs with handlers resolved up front
+Code = Tuple[Tuple[Callable[[Any, Statement], None], Statement], ...]
+
+# Binary operators; keyword spellings (eq, lt, ...) share the symbol's function
+BINARY_OPS = {
+    '+': operator.add,  # Works for numbers AND strings!
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+    '//': lambda left, right: int(left // right),
+    '%': operator.mod,
+    '==': operator.eq,
+    'eq': operator.eq,
+    '!=': operator.ne,
+    'ne': operator.ne,
+    '<': operator.lt,
+    'lt': operator.lt,
+    '>': operator.gt,
+    'gt': operator.gt,
+    '<=': operator.le,
+    'le': operator.le,
+    '>=': operator.ge,
+    'ge': operator.ge,
+    'and': lambda left, right: left and right,
+    'or': lambda left, right: left or right,
+    'in': lambda left, right: left in right,
+    'not in': lambda left, right: left not in right,
+    'is': operator.is_,
+    'is not': operator.is_not,
+}
+
+# Names handled by Interpreter._call_builtin. These are matched before
+# blocks, globals and user functions, so a call site can be classified once.
+BUILTIN_CALLS = frozenset({
+    'print', 'sleep', 'input', 'int', 'str', 'len', 'abs', 'rjust',
+    'globals', 'setattr', 'exit',
+    # Graphics
+    'window', 'close_window', 'is_window_open', 'clear', 'fill', 'rect',
+    'circle', 'line', 'text', 'update', 'color', 'is_key_pressed',
+    'get_last_key', 'clear_last_key',
+})
+
+# Unary operators
+UNARY_OPS = {
+    '-': operator.neg,
+    'not': operator.not_,
+}
+
+def resolve_binary_op(op: str) -> Callable[[Any, Any], Any]:
+    """Look up the function implementing a binary operator"""
+    op_fn = BINARY_OPS.get(op)
+    if op_fn is None:
+        def op_fn(left, right):
+            raise NotImplementedError(f"Operator {op} not implemented")
+    return op_fn
+
+def resolve_unary_op(op: str) -> Callable[[Any], Any]:
+    """Look up the function implementing a unary operator"""
+    op_fn = UNARY_OPS.get(op)
+    if op_fn is None:
+        def op_fn(operand):
+            raise NotImplementedError(f"Unary operator {op} not implemented")
+    return op_fn
+
+def walk(node: ASTNode):
+    """Yield node and every AST node nested inside it"""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+        for field in fields(node):
+            value = getattr(node, field.name)
+            if isinstance(value, ASTNode):
+                stack.append(value)
+            elif isinstance(value, (list, tuple)):
+                stack.extend(item for item in value if isinstance(item, ASTNode))
+
+def specialize(node: ASTNode):
+    """Resolve per-node lookups (operators, builtin calls) ahead of execution"""
+    for child in walk(node):
+        if type(child) is BinaryOp:
+            child._op_fn = resolve_binary_op(child.operator)
+        elif type(child) is UnaryOp:
+            child._op_fn = resolve_unary_op(child.operator)
+        elif type(child) is CallExpression:
+            child._builtin = child.name in BUILTIN_CALLS
+
+# Literal nodes whose value can take part in constant folding
+CONSTANT_LITERALS = frozenset({NumberLiteral, StringLiteral, BooleanLiteral})
+
+# Identity depends on object caching, so `is` is never folded
+UNFOLDABLE_OPS = frozenset({'is', 'is not'})
+
+# Longest string a fold may produce (the same cap as CPython's optimizer).
+# Folding runs on every body, executed or not, and the result stays in the
+# AST, so bigger strings are left to be built at run time
+MAX_FOLDED_LENGTH = 4096
+
+def repeat_too_large(operator: str, left: Any, right: Any) -> bool:
+    """Check whether folding a string repeat would exceed MAX_FOLDED_LENGTH"""
+    if operator != '*':
+        return False
+    if type(left) is str:
+        text, count = left, right
+    elif type(right) is str:
+        text, count = right, left
+    else:
+        return False
+    return type(count) in (int, bool) and len(text) * count > MAX_FOLDED_LENGTH
+
+def make_literal(value: Any):
+    """Wrap a folded value in a literal node, or return None if it has no literal form"""
+    if type(value) is bool:
+        return BooleanLiteral(value)
+    if type(value) in (int, float):
+        return NumberLiteral(value)
+    if type(value) is str and len(value) <= MAX_FOLDED_LENGTH:
+        return StringLiteral(value)
+    return None
+
+def fold(expr: ASTNode) -> ASTNode:
+    """Collapse an operator node over literal operands into a literal.
+
+    Operands must already be folded. Anything that would raise at runtime
+    (e.g. division by zero) is left alone so the error still happens there.
+    """
+    node_type = type(expr)
+    try:
+        if node_type is BinaryOp:
+            if (type(expr.left) in CONSTANT_LITERALS and type(expr.right) in CONSTANT_LITERALS
+                    and expr.operator not in UNFOLDABLE_OPS and expr.operator in BINARY_OPS
+                    and not repeat_too_large(expr.operator, expr.left.value, expr.right.value)):
+                folded = make_literal(BINARY_OPS[expr.operator](expr.left.value, expr.right.value))
+                if folded is not None:
+                    return folded
+        elif node_type is UnaryOp:
+            if type(expr.operand) in CONSTANT_LITERALS and expr.operator in UNARY_OPS:
+                folded = make_literal(UNARY_OPS[expr.operator](expr.operand.value))
+                if folded is not None:
+                    return folded
+        elif node_type is TernaryOp:
+            if type(expr.condition) in CONSTANT_LITERALS:
+                return expr.true_expr if expr.condition.value else expr.false_expr
+    except Exception:
+        pass
+    return expr
+
+def fold_constants(node: ASTNode):
+    """Fold constant subexpressions of node in place, bottom-up"""
+    for field in fields(node):
+        value = getattr(node, field.name)
+        if isinstance(value, ASTNode):
+            fold_constants(value)
+            folded = fold(value)
+            if folded is not value:
+                setattr(node, field.name, folded)
+        elif isinstance(value, list):
+            for i, item in enumerate(value):
+                if isinstance(item, ASTNode):
+                    fold_constants(item)
+                    folded = fold(item)
+                    if folded is not item:
+                        value[i] = folded
+
+# Expression nodes that only read state (no calls, no block control).
+# MemberAccess is left out: attribute reads on Python objects can run
+# properties or __getattr__, so only block properties are known to be pure
+PURE_EXPRESSIONS = frozenset({
+    Identifier, NumberLiteral, StringLiteral, BooleanLiteral,
+    NoneLiteral, ListLiteral, TupleLiteral, DictLiteral, BinaryOp, UnaryOp,
+    TernaryOp,
+})
+
+def is_pure(expr: ASTNode, block_names: Collection[str] = ()) -> bool:
+    """Check whether evaluating an expression cannot change program state.
+
+    Property reads such as `go.status` count as pure for blocks named in
+    block_names.
+    """
+    for node in walk(expr):
+        node_type = type(node)
+        if node_type is MemberAccess:
+            if not (type(node.object) is Identifier and node.object.name in block_names):
+                return False
+        elif node_type not in PURE_EXPRESSIONS:
+            return False
+    return True
+
+def is_passive(statements: List[Statement], block_names: Collection[str] = ()) -> bool:
+    """Check whether a body is only `when` statements with pure conditions.
+
+    Such a body does nothing on a pass where no condition holds, so running
+    it again can only make progress once another thread changes state.
+    """
+    return bool(statements) and all(
+        type(stmt) is WhenStatement and is_pure(stmt.condition, block_names)
+        for stmt in statements
+    )
+
+def compile_block(statements: List[Statement]) -> Code:
+    """Lower a statement list to (handler, statement) pairs"""
+    for stmt in statements:
+        fold_constants(stmt)
+        specialize(stmt)
+    return tuple((type(stmt)._exec, stmt) for stmt in statements)
+
+def compile_node(node: ASTNode) -> Code:
+    """Compile a node's body (block, main, function, when, with), caching
+    the result on the node.
+
+    Hot reload reuses unchanged AST nodes, so only edited code recompiles.
+    """
+    code = getattr(node, '_code', None)
+    if code is None:
+        code = compile_block(node.body)
+        node._code = code
+    return code
+
+def run_code(interpreter, code: Code):
+    """Execute compiled code, returning the first non-None flow signal"""
+    for handler, stmt in code:
+        flow = handler(interpreter, stmt)
+        if flow is not None:
+            return flow
+    return None
+
+# Operators a numeric kernel can use, mapped to their Python spelling
+KERNEL_OPS = {
+    '+': '+', '-': '-', '*': '*', '/': '/', '%': '%', '//': '//',
+    '==': '==', 'eq': '==', '!=': '!=', 'ne': '!=',
+    '<': '<', 'lt': '<', '>': '>', 'gt': '>',
+    '<=': '<=', 'le': '<=', '>=': '>=', 'ge': '>=',
+}
+
+# Variable types a kernel accepts; anything else runs the interpreted body
+NUMERIC_TYPES = (int, float)
+
+_UNSET = object()
+
+class NumericKernel:
+    """A block body of numeric assignments compiled to one Python function.
+
+    The function takes the variables the body reads and returns the ones it
+    assigns, so a run is one call instead of a walk over the statements.
+    """
+
+    def __init__(self, func: Callable, inputs: List[str], outputs: List[str], source: str):
+        self.func = func
+        self.inputs = inputs
+        self.outputs = outputs
+        self.source = source  # Kept so the kernel can be rebuilt in a worker process
+
+    def run(self, variables: dict) -> bool:
+        """Run against a variable table; False means run the interpreted body.
+
+        Nothing is written unless the whole body succeeds, so on an error the
+        interpreted body can run instead and report it as usual.
+        """
+        args = []
+        for name in self.inputs:
+            value = variables.get(name, _UNSET)
+            if type(value) not in NUMERIC_TYPES:
+                return False
+            args.append(value)
+        try:
+            results = self.func(*args)
+        except Exception:
+            return False
+        for name, value in zip(self.outputs, results):
+            variables[name] = value
+        return True
+
+def _kernel_expr(expr: ASTNode, slots: dict, inputs: List[str]) -> Optional[str]:
+    """Python source for a numeric expression, or None if it is not numeric"""
+    node_type = type(expr)
+    if node_type is NumberLiteral:
+        text = repr(expr.value)
+        # inf/nan have no literal spelling
+        return None if text in ('inf', '-inf', 'nan') else text
+    if node_type is Identifier:
+        name = expr.name
+        if name not in slots:
+            slots[name] = f"v{len(slots)}"
+            inputs.append(name)
+        return slots[name]
+    if node_type is UnaryOp and expr.operator == '-':
+        operand = _kernel_expr(expr.operand, slots, inputs)
+        return None if operand is None else f"(-{operand})"
+    if node_type is BinaryOp:
+        op = KERNEL_OPS.get(expr.operator)
+        if op is None:
+            return None
+        left = _kernel_expr(expr.left, slots, inputs)
+        right = _kernel_expr(expr.right, slots, inputs)
+        if left is None or right is None:
+            return None
+        if op == '//':
+            return f"int({left} // {right})"
+        return f"({left} {op} {right})"
+    return None
+
+def compile_kernel(statements: List[Statement], jit: bool = False) -> Optional[NumericKernel]:
+    """Compile a body made only of numeric assignments to a NumericKernel.
+
+    Returns None for any other body. With jit and numba installed the kernel
+    is compiled to native code; integers are then fixed-width.
+    """
+    slots = {}
+    inputs = []
+    outputs = []
+    lines = []
+    for stmt in statements:
+        if type(stmt) is PassStatement:
+            continue
+        if type(stmt) is not Assignment:
+            return None
+        value = _kernel_expr(stmt.value, slots, inputs)
+        if value is None:
+            return None
+        if stmt.name not in slots:
+            slots[stmt.name] = f"v{len(slots)}"
+        if stmt.name not in outputs:
+            outputs.append(stmt.name)
+        lines.append(f"    {slots[stmt.name]} = {value}")
+    if not outputs:
+        return None
+
+    params = ", ".join(slots[name] for name in inputs)
+    results = "".join(f"{slots[name]}, " for name in outputs)
+    source = f"def kernel({params}):\n" + "\n".join(lines) + f"\n    return ({results})\n"
+    return NumericKernel(_build_kernel(source, jit), inputs, outputs, source)
+
+def _build_kernel(source: str, jit: bool) -> Callable:
+    """Turn generated kernel source into a callable"""
+    namespace = {}
+    exec(source, namespace)
+    func = namespace['kernel']
+    if jit and njit is not None:
+        func = njit(nogil=True)(func)
+    return func
+
+# Kernels built by run_kernel_loop in this process, keyed by (source, jit),
+# so a block run in chunks builds its kernel once per worker
+_loop_kernels = {}
+
+def run_kernel_loop(source: str, inputs: List[str], outputs: List[str],
+                    values: List[Any], iterations: int, jit: bool = False) -> dict:
+    """Run a kernel for a number of iterations, feeding its outputs back in.
+
+    Module-level and given only plain data so it can run in a worker
+    process. Returns the final values of the variables the kernel assigns.
+    """
+    func = _loop_kernels.get((source, jit))
+    if func is None:
+        func = _loop_kernels[(source, jit)] = _build_kernel(source, jit)
+    state = dict(zip(inputs, values))
+    for _ in range(iterations):
+        state.update(zip(outputs, func(*[state[name] for name in inputs])))
+    return {name: state[name] for name in outputs}
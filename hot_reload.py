@@ -5,43 +5,101 @@ Watches source files and reloads blocks dynamically
 """
 
 import os
-import time
 import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Optional, Set, Any
+from typing import Callable, Dict, List, Optional, Set, Tuple, Any
 from dataclasses import dataclass
 import hashlib
 
+# Optional: kernel file notifications (inotify/FSEvents/ReadDirectoryChangesW)
+try:
+    from watchdog.observers import Observer
+    from watchdog.observers.polling import PollingObserver
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    PollingObserver = None
+    FileSystemEventHandler = object
+
 @dataclass
 class FileState:
     """Tracks state of a source file"""
     path: str
-    last_modified: float
-    content_hash: str
+    last_modified: int  # st_mtime_ns
+    size: int
+    content_hash: Optional[str] = None  # Computed lazily, only when stat changes
 
     @staticmethod
     def from_file(path: str) -> 'FileState':
-        stat = os.stat(path)
-        with open(path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        """Snapshot a file with a single stat call (no read, no hashing)"""
+        return FileState.from_stat(path, os.stat(path))
+
+    @staticmethod
+    def from_stat(path: str, stat: os.stat_result) -> 'FileState':
+        """Snapshot a file from an existing stat result"""
         return FileState(
             path=path,
-            last_modified=stat.st_mtime,
-            content_hash=hashlib.md5(content.encode()).hexdigest()
+            last_modified=stat.st_mtime_ns,
+            size=stat.st_size
         )
 
+    def same_stat(self, other: 'FileState') -> bool:
+        """Check whether (mtime, size) match another snapshot"""
+        return self.last_modified == other.last_modified and self.size == other.size
+
+    def get_hash(self) -> str:
+        """Read and hash the file contents, caching the result"""
+        if self.content_hash is None:
+            with open(self.path, 'rb') as f:
+                self.content_hash = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+        return self.content_hash
+
+class _SourceEventHandler(FileSystemEventHandler):
+    """Forwards filesystem events for watched files to the reloader"""
+
+    def __init__(self, reloader: 'HotReloader'):
+        super().__init__()
+        self.reloader = reloader
+
+    def on_any_event(self, event):
+        if event.is_directory:
+            return
+        # Editors often save via rename, so check the destination path too
+        paths = [path for path in (event.src_path, getattr(event, 'dest_path', None))
+                 if path in self.reloader._watched]
+        if paths:
+            self.reloader._check_for_changes(paths)
+
 class HotReloader:
     """Manages hot reloading of WHEN blocks"""
 
     def __init__(self, interpreter, source_file: str):
         self.interpreter = interpreter
         self.source_file = source_file
-        self.file_state: Optional[FileState] = None
+        # Watched files: absolute path -> last snapshot / change callback.
+        # One observer or polling thread serves all of them.
+        self._watched: Dict[str, FileState] = {}
+        self._callbacks: Dict[str, Callable[[], None]] = {}
+        self._observed_dirs: Set[str] = set()
         self.watching = False
         self.watch_thread: Optional[threading.Thread] = None
-        self.watch_interval = 0.5  # Check every 500ms
+        self.observer = None
+        self.watch_interval = 0.5  # Minimum poll interval (500ms)
+        self.max_watch_interval = 8.0  # Idle polls back off up to 8s
+        self._cur_interval = self.watch_interval
         self.reload_lock = threading.Lock()
+        self._wake_event = threading.Event()  # Interrupts the poll wait (stop / force_check)
         self.preserved_state: Dict[str, Dict[str, Any]] = {}
+        self.parse_cache: 'OrderedDict[str, Any]' = OrderedDict()  # content hash -> (Program, layout)
+        self.parse_cache_size = 16
+        # Last parsed source, for incremental reparsing of single-item edits
+        self._last_lines: List[str] = []
+        self._last_program = None
+        self._last_layout: List[Tuple[int, Any]] = []
+        # Source hashes of the live functions / blocks, so unchanged ones are skipped
+        self._decl_hashes: Dict[str, str] = {}
+        self._block_hashes: Dict[str, str] = {}
 
     def start_watching(self):
         """Start watching the source file for changes"""
@@ -49,54 +107,168 @@ class HotReloader:
             return
 
         self.watching = True
-        self.file_state = FileState.from_file(self.source_file)
-        self.watch_thread = threading.Thread(target=self._watch_loop, daemon=True)
-        self.watch_thread.start()
+        self.watch(self.source_file, self._reload_blocks)
+
+        # Seed the incremental parser with the source as it was started
+        try:
+            with open(self.source_file, 'r', encoding='utf-8') as f:
+                program = self._parse_source(f.read())
+            self._record_hashes(program)
+        except Exception:
+            pass
+
+        # Prefer kernel notifications; fall back to stat polling when watchdog
+        # is unavailable or would only poll itself (e.g. on network filesystems)
+        if not self._start_observer():
+            self.watch_thread = threading.Thread(target=self._watch_loop, daemon=True)
+            self.watch_thread.start()
         print(f"[HOT RELOAD] Watching {self.source_file} for changes...")
 
+    def watch(self, path: str, callback: Callable[[], None]):
+        """Register a file; callback runs whenever its contents change"""
+        key = os.path.abspath(path)
+        state = FileState.from_file(path)
+        state.get_hash()
+        self._watched[key] = state
+        self._callbacks[key] = callback
+
+        if self.observer is not None:
+            self._observe_dir(self.observer, os.path.dirname(key))
+
+    def _observe_dir(self, observer, directory: str):
+        """Schedule a directory on the observer once"""
+        if directory not in self._observed_dirs:
+            observer.schedule(_SourceEventHandler(self), directory, recursive=False)
+            self._observed_dirs.add(directory)
+
+    def _start_observer(self) -> bool:
+        """Start a watchdog observer on the watched directories, if possible"""
+        if Observer is None:
+            return False
+
+        observer = Observer()
+        if isinstance(observer, PollingObserver):
+            return False
+
+        try:
+            for key in self._watched:
+                self._observe_dir(observer, os.path.dirname(key))
+            observer.start()
+        except Exception as e:
+            print(f"[HOT RELOAD] File notifications unavailable ({e}), polling instead")
+            self._observed_dirs.clear()
+            return False
+
+        self.observer = observer
+        return True
+
     def stop_watching(self):
         """Stop watching the source file"""
         self.watching = False
+        self._wake_event.set()
+        if self.observer:
+            self.observer.stop()
+            self.observer.join(timeout=1.0)
         if self.watch_thread:
             self.watch_thread.join(timeout=1.0)
 
+    def force_check(self):
+        """Check for changes now instead of at the next poll (e.g. on save)"""
+        if self.watch_thread is not None:
+            # Wake the polling thread so checks stay on one thread
+            self._wake_event.set()
+        elif self.watching:
+            self._check_for_changes()
+
     def _watch_loop(self):
-        """Main watch loop that checks for file changes"""
+        """Polling fallback that checks for file changes"""
         while self.watching:
-            try:
-                current_state = FileState.from_file(self.source_file)
-
-                # Check if file has changed
-                if (current_state.last_modified != self.file_state.last_modified or
-                    current_state.content_hash != self.file_state.content_hash):
-
-                    print(f"[HOT RELOAD] Detected changes in {self.source_file}")
-                    self._reload_blocks()
-                    self.file_state = current_state
-
-            except Exception as e:
-                print(f"[HOT RELOAD] Error checking file: {e}")
-
-            time.sleep(self.watch_interval)
+            if self._check_for_changes():
+                # Activity - poll quickly again while the user is editing
+                self._cur_interval = self.watch_interval
+            else:
+                # Idle tick - back off geometrically up to the cap
+                self._cur_interval = min(self.max_watch_interval, self._cur_interval * 2)
+
+            # Sleep until the next poll, or until stopped / forced to check
+            self._wake_event.wait(self._cur_interval)
+            self._wake_event.clear()
+
+    def _check_for_changes(self, paths: Optional[List[str]] = None) -> bool:
+        """Run callbacks for watched files whose contents changed.
+
+        Checks the given absolute paths, or every watched file. Returns True
+        if any file's stat changed since the previous check.
+        """
+        changed = False
+        try:
+            if paths is None:
+                paths = list(self._watched)
+
+            for key, current_state in self._stat_files(paths).items():
+                previous = self._watched[key]
+
+                # Fast path: unchanged (mtime, size) means no read and no hash
+                if current_state.same_stat(previous):
+                    continue
+                changed = True
+
+                # Stat changed - only reload if the contents actually differ
+                if current_state.get_hash() != previous.get_hash():
+                    print(f"[HOT RELOAD] Detected changes in {previous.path}")
+                    self._callbacks[key]()
+                self._watched[key] = current_state
+
+        except Exception as e:
+            print(f"[HOT RELOAD] Error checking file: {e}")
+        return changed
+
+    def _stat_files(self, paths: List[str]) -> Dict[str, FileState]:
+        """Stat watched files back to back, grouped by directory.
+
+        A directory holding several watched files is read with one scandir
+        (whose entries carry stat data, free on Windows) instead of a stat
+        per file. Files that are missing, e.g. mid-save, are skipped.
+        """
+        by_dir: Dict[str, List[str]] = {}
+        for key in paths:
+            by_dir.setdefault(os.path.dirname(key), []).append(key)
+
+        states = {}
+        for directory, keys in by_dir.items():
+            if len(keys) == 1:
+                key = keys[0]
+                try:
+                    states[key] = FileState.from_stat(self._watched[key].path, os.stat(key))
+                except FileNotFoundError:
+                    pass
+                continue
+
+            wanted = set(keys)
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.path in wanted:
+                        states[entry.path] = FileState.from_stat(
+                            self._watched[entry.path].path, entry.stat())
+        return states
 
     def _reload_blocks(self):
-        """Reload blocks from the source file"""
+        """Reload blocks from the source file.
+
+        The interpreter never takes reload_lock; it only serializes reloads.
+        New block/function tables are built off to the side and published
+        with a single attribute store or dict.update, so the interpreter
+        always sees either the old or the new definitions.
+        """
         with self.reload_lock:
             try:
                 # Save state of running blocks
                 self._preserve_block_state()
 
-                # Parse the updated source
-                from lexer import Lexer
-                from parser import Parser
-
                 with open(self.source_file, 'r', encoding='utf-8') as f:
                     source = f.read()
 
-                lexer = Lexer(source)
-                tokens = lexer.tokenize()
-                parser = Parser(tokens)
-                program = parser.parse()
+                program = self._parse_source(source)
 
                 # Update functions and non-block declarations
                 self._update_declarations(program)
@@ -112,12 +284,176 @@ class HotReloader:
             except Exception as e:
                 print(f"[HOT RELOAD] Error reloading: {e}")
 
+    def _parse_source(self, source: str):
+        """Parse source into a Program, reusing cached ASTs for seen contents"""
+        key = hashlib.blake2b(source.encode(), digest_size=16).hexdigest()
+        lines = source.splitlines(keepends=True)
+
+        entry = self.parse_cache.get(key)
+        if entry is not None:
+            self.parse_cache.move_to_end(key)
+        else:
+            # Try to reparse only the edited top-level item before a full parse
+            entry = self._parse_incremental(lines)
+            if entry is None:
+                entry = self._parse_full(source)
+
+            self.parse_cache[key] = entry
+            if len(self.parse_cache) > self.parse_cache_size:
+                self.parse_cache.popitem(last=False)
+
+        program, layout = entry
+        self._hash_items(lines, layout)
+        self._last_lines = lines
+        self._last_program = program
+        self._last_layout = layout
+        return program
+
+    @staticmethod
+    def _hash_items(lines, layout):
+        """Attach _src_hash to each top-level node from the lines it spans.
+
+        Nodes reused from an earlier parse already carry their hash.
+        """
+        for i, (start, node) in enumerate(layout):
+            if getattr(node, '_src_hash', None) is not None:
+                continue
+            end = layout[i + 1][0] - 1 if i + 1 < len(layout) else len(lines)
+            text = ''.join(lines[start - 1:end])
+            node._src_hash = hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+    def _record_hashes(self, program):
+        """Remember the source hashes of the functions and blocks now live"""
+        from ast_nodes import FuncDeclaration
+
+        self._decl_hashes = {
+            decl.name: getattr(decl, '_src_hash', None)
+            for decl in program.declarations if type(decl) is FuncDeclaration
+        }
+        self._block_hashes = {
+            block.name: getattr(block, '_src_hash', None) for block in program.blocks
+        }
+
+    def _parse_full(self, source: str):
+        """Lex and parse the whole source, returning (program, layout)"""
+        from lexer import Lexer
+        from parser import Parser
+
+        lexer = Lexer(source)
+        tokens = lexer.tokenize()
+        parser = Parser(tokens)
+        program = parser.parse()
+        return program, parser.layout
+
+    def _parse_incremental(self, lines):
+        """Reparse only the top-level item containing the edit.
+
+        Diffs the new lines against the previous source, finds the single
+        declaration or block whose line span contains the changed region and
+        reparses just that slice. Returns (program, layout), or None when the
+        edit spans several items or changes the top-level structure, in which
+        case the caller falls back to a full parse. Cached programs are never
+        mutated; a new Program sharing the unchanged nodes is built instead.
+        """
+        from ast_nodes import Program, MainBlock, Block as BlockNode
+        from lexer import Lexer, TokenType
+        from parser import Parser
+
+        if self._last_program is None:
+            return None
+
+        old = self._last_lines
+        layout = self._last_layout
+        if not layout:
+            return None
+
+        # Changed region: old lines [prefix, len(old) - suffix) become
+        # new lines [prefix, len(lines) - suffix)
+        limit = min(len(old), len(lines))
+        prefix = 0
+        while prefix < limit and old[prefix] == lines[prefix]:
+            prefix += 1
+        suffix = 0
+        while (suffix < limit - prefix and
+               old[len(old) - 1 - suffix] == lines[len(lines) - 1 - suffix]):
+            suffix += 1
+        delta = len(lines) - len(old)
+
+        # 1-based line numbers of the first and last changed old lines
+        # (dirty_end < dirty_start for a pure insertion)
+        dirty_start = prefix + 1
+        dirty_end = len(old) - suffix
+
+        # Item i covers lines [start_i, start_{i+1} - 1]; the last runs to EOF
+        index = None
+        for i, (start, _) in enumerate(layout):
+            end = layout[i + 1][0] - 1 if i + 1 < len(layout) else len(old)
+            if start <= dirty_start and dirty_end <= end:
+                # An insertion right before a header may start a new item
+                if dirty_end < dirty_start and dirty_start == start:
+                    return None
+                index = i
+                break
+
+        if index is None:
+            # Edits confined to leading comments/blank lines only shift line numbers
+            first = layout[0][0]
+            if dirty_start < first and dirty_end < first:
+                preamble = ''.join(lines[:first - 1 + delta])
+                try:
+                    tokens = Lexer(preamble).tokenize()
+                except SyntaxError:
+                    return None
+                if all(t.type in (TokenType.NEWLINE, TokenType.EOF) for t in tokens):
+                    shifted = [(start + delta, node) for start, node in layout]
+                    return self._last_program, shifted
+            return None
+
+        start, old_node = layout[index]
+        end = layout[index + 1][0] - 1 if index + 1 < len(layout) else len(old)
+        chunk = ''.join(lines[start - 1:end + delta])
+
+        try:
+            parser = Parser(Lexer(chunk).tokenize())
+            items = parser.parse_items()
+        except SyntaxError:
+            # Let the full parse report the error with real line numbers
+            return None
+
+        if len(items) != 1:
+            return None
+        rel_line, new_node = items[0]
+
+        # The item must stay in the same Program slot
+        def kind(node):
+            if isinstance(node, MainBlock):
+                return 'main'
+            if isinstance(node, BlockNode):
+                return 'block'
+            return 'decl'
+
+        if kind(new_node) != kind(old_node):
+            return None
+
+        program = self._last_program
+        declarations = [new_node if d is old_node else d for d in program.declarations]
+        blocks = [new_node if b is old_node else b for b in program.blocks]
+        main = new_node if program.main is old_node else program.main
+
+        new_layout = layout[:index]
+        new_layout.append((start + rel_line - 1, new_node))
+        new_layout.extend((s + delta, node) for s, node in layout[index + 1:])
+
+        return Program(declarations, blocks, main), new_layout
+
     def _preserve_block_state(self):
         """Save the state of currently running blocks"""
+        from interpreter import BlockStatus
+
         self.preserved_state.clear()
 
         for block_name, block in self.interpreter.blocks.items():
-            if block.status.name == "RUNNING":
+            if block.status is BlockStatus.RUNNING:
                 self.preserved_state[block_name] = {
                     'current_iteration': block.current_iteration,
                     'status': block.status,
@@ -125,20 +461,18 @@ class HotReloader:
                 }
 
     def _restore_block_state(self):
-        """Restore state to blocks that were running before reload"""
-        for block_name, state in self.preserved_state.items():
-            if block_name in self.interpreter.blocks:
-                block = self.interpreter.blocks[block_name]
-
-                # Restore iteration count
-                block.current_iteration = state['current_iteration']
-
-                # Restart block if it was running
-                if state['was_running']:
-                    block.status = state['status']
-                    if block_name not in self.interpreter.running_blocks:
-                        self.interpreter.running_blocks.append(block_name)
-
+        """Reschedule blocks that were running before reload.
+
+        Their iteration and status were already carried over from the live
+        block just before the new table was published.
+        """
+        from interpreter import BlockStatus
+
+        blocks = self.interpreter.blocks
+        for block_name in self.preserved_state:
+            block = blocks.get(block_name)
+            if block is not None and block.status is BlockStatus.RUNNING:
+                self.interpreter.schedule_block(block_name)
                 print(f"[HOT RELOAD] Restored state for block '{block_name}'")
 
     def _update_declarations(self, program):
@@ -148,76 +482,100 @@ class HotReloader:
             FromImportDeclaration, VarDeclaration
         )
 
+        functions = {}
+        hashes = {}
+
         for decl in program.declarations:
-            if isinstance(decl, FuncDeclaration):
+            if type(decl) is FuncDeclaration:
+                # Skip functions whose source is unchanged since the last reload
+                src_hash = getattr(decl, '_src_hash', None)
+                hashes[decl.name] = src_hash
+                if (src_hash is not None and self._decl_hashes.get(decl.name) == src_hash
+                        and decl.name in self.interpreter.functions):
+                    continue
+
                 # Update function definition
                 old_func = self.interpreter.functions.get(decl.name)
-                self.interpreter.functions[decl.name] = decl
+                functions[decl.name] = decl
                 if old_func:
                     print(f"[HOT RELOAD] Updated function '{decl.name}'")
                 else:
                     print(f"[HOT RELOAD] Added new function '{decl.name}'")
 
-            elif isinstance(decl, ImportDeclaration):
+            elif type(decl) is ImportDeclaration:
                 # Re-handle imports (in case new imports were added)
                 self.interpreter.handle_import(decl)
 
-            elif isinstance(decl, FromImportDeclaration):
+            elif type(decl) is FromImportDeclaration:
                 self.interpreter.handle_from_import(decl)
 
             # Note: We don't reload variable declarations to preserve runtime state
 
+        # Publish all function updates at once; update() is a single C call,
+        # so definitions the interpreter registers meanwhile are not lost
+        self.interpreter.functions.update(functions)
+        self._decl_hashes = hashes
+
     def _update_blocks(self, program):
         """Update block definitions while preserving state"""
-        from ast_nodes import (
-            OSBlock, DEBlock, FOBlock,
-            ParallelDEBlock, ParallelFOBlock
-        )
-        from interpreter import Block
+        from interpreter import BlockStatus
+
+        # Build the new table off to the side; the interpreter keeps using
+        # the current one until it is published below
+        old_blocks = self.interpreter.blocks
+        blocks = dict(old_blocks)
 
         # Track which blocks exist in the new source
         new_block_names = set()
+        hashes = {}
 
         for block in program.blocks:
             new_block_names.add(block.name)
 
-            # Determine block type and create new block instance
-            if isinstance(block, OSBlock):
-                new_block = Block(block.name, block.body, None, "os", False)
-            elif isinstance(block, ParallelDEBlock):
-                new_block = Block(block.name, block.body, block.iterations, "de", True)
-            elif isinstance(block, ParallelFOBlock):
-                new_block = Block(block.name, block.body, None, "fo", True)
-            elif isinstance(block, DEBlock):
-                new_block = Block(block.name, block.body, block.iterations, "de", False)
-            else:  # Regular FOBlock
-                new_block = Block(block.name, block.body, None, "fo", False)
-
-            # Check if block already exists
-            if block.name in self.interpreter.blocks:
-                old_block = self.interpreter.blocks[block.name]
+            # Keep the live block (and its state) when its source is unchanged
+            src_hash = getattr(block, '_src_hash', None)
+            hashes[block.name] = src_hash
+            if (src_hash is not None and self._block_hashes.get(block.name) == src_hash
+                    and block.name in old_blocks):
+                self.preserved_state.pop(block.name, None)
+                continue
 
-                # Preserve runtime state if block was running
-                if old_block.status.name == "RUNNING":
-                    new_block.current_iteration = old_block.current_iteration
-                    new_block.status = old_block.status
+            new_block = self.interpreter.make_block(block)
 
+            # Check if block already exists
+            if block.name in old_blocks:
                 print(f"[HOT RELOAD] Updated block '{block.name}'")
             else:
                 print(f"[HOT RELOAD] Added new block '{block.name}'")
 
             # Replace block definition
-            self.interpreter.blocks[block.name] = new_block
+            blocks[block.name] = new_block
 
         # Remove blocks that no longer exist in source
-        blocks_to_remove = []
-        for block_name in self.interpreter.blocks.keys():
+        for block_name in list(blocks):
             if block_name not in new_block_names:
-                blocks_to_remove.append(block_name)
-
-        for block_name in blocks_to_remove:
-            # Stop block if it's running
-            if block_name in self.interpreter.running_blocks:
-                self.interpreter.running_blocks.remove(block_name)
-            del self.interpreter.blocks[block_name]
-            print(f"[HOT RELOAD] Removed block '{block_name}'")
\ No newline at end of file
+                # Stop block if it's running
+                self.interpreter.unschedule_block(block_name)
+                del blocks[block_name]
+                print(f"[HOT RELOAD] Removed block '{block_name}'")
+
+        # Carry over runtime state from the live blocks as late as possible,
+        # then publish the new table with a single attribute store
+        replaced = []
+        for block_name, old_block in old_blocks.items():
+            new_block = blocks.get(block_name)
+            if new_block is not None and new_block is not old_block:
+                if old_block.status is BlockStatus.RUNNING:
+                    new_block.current_iteration = old_block.current_iteration
+                    new_block.status = old_block.status
+                    replaced.append(old_block)
+
+        self.interpreter.blocks = blocks
+
+        # The scheduler holds Block objects: swap in the new ones, then retire
+        # the old ones so a stale snapshot cannot run them again
+        for old_block in replaced:
+            if not old_block.is_parallel:
+                self.interpreter.schedule_block(old_block.name)
+                old_block.status = BlockStatus.STOPPED
+        self._block_hashes = hashes
@@ -3,10 +3,23 @@ import sys
 import os
 import threading
 import queue
+import types
+import multiprocessing
+import concurrent.futures
 from typing import Dict, Any, Optional, List, Union
 from ast_nodes import *
+from compiler import (
+    compile_block, compile_node, compile_kernel, run_code, run_kernel_loop,
+    resolve_binary_op, resolve_unary_op, is_passive, BUILTIN_CALLS, NUMERIC_TYPES
+)
 from enum import Enum, auto
 
+# Statement completion signals. Handlers return None when execution falls
+# through, FLOW_BREAK/FLOW_CONTINUE for loop control, or (FLOW_RETURN, value).
+FLOW_BREAK = 1
+FLOW_CONTINUE = 2
+FLOW_RETURN = 3
+
 class ControlFlow(Exception):
     pass
 
@@ -23,35 +36,100 @@ class ReturnException(ControlFlow):
     def __init__(self, value=None):
         self.value = value
 
+# Without a GIL (free-threaded builds) single dict reads/writes are not
+# guaranteed atomic, so variable access always takes the lock there
+_GIL_ENABLED = getattr(sys, '_is_gil_enabled', lambda: True)()
+
+# Default delay between iterations of a parallel block (tick=<seconds>)
+PARALLEL_TICK = 0.01
+
+# Iterations a process=True block hands its worker per call. Stop, exit
+# and tick are checked between calls, and progress is written back after each
+PROCESS_CHUNK = 100000
+
+# Threads kept for parallel blocks. A running parallel block holds one for
+# its whole run (FO blocks until stopped), so this is sized for how many
+# usually run at once rather than for CPU count; blocks started while all
+# of them are held get a thread of their own.
+PARALLEL_WORKERS = 64
+
+# Method kinds an inline cache may call as func(obj, *args)
+CACHEABLE_METHODS = (types.FunctionType, types.MethodDescriptorType, types.WrapperDescriptorType)
+
+# Built-in function handlers by name, filled in by _install_dispatch
+BUILTIN_HANDLERS: Dict[str, Any] = {}
+
+# Marks a parameter name that had no previous binding during a call
+_MISSING = object()
+
+def _import_module(name: str, fromlist=()):
+    """Return the module called name, importing it only if needed.
+
+    Already-imported modules come straight from sys.modules. A from-import
+    still goes through __import__ when a requested name is missing, since
+    it may be a submodule that has not been loaded yet.
+    """
+    module = sys.modules.get(name)
+    if module is None or not all(hasattr(module, item) for item in fromlist):
+        __import__(name, fromlist=fromlist)
+        module = sys.modules[name]
+    return module
+
 class BlockStatus(Enum):
     STOPPED = auto()
     RUNNING = auto()
     COMPLETED = auto()
 
+# Enum member lookups go through the metaclass; the scheduler compares
+# statuses every tick, so it uses these module-level aliases instead
+BLOCK_STOPPED = BlockStatus.STOPPED
+BLOCK_RUNNING = BlockStatus.RUNNING
+BLOCK_COMPLETED = BlockStatus.COMPLETED
+
 class Block:
+    # Many blocks live for the whole run and their fields are read every tick
+    __slots__ = (
+        'name', 'body', 'iterations', 'current_iteration', 'status',
+        'block_type', 'is_parallel', 'future', 'should_stop', 'tick_interval',
+        'process_parallel', 'code', 'kernel', 'step',
+        'saved_iteration', 'saved_status', 'has_saved_state',
+    )
+
     def __init__(self, name: str, body: List[Statement], iterations: Union[int, tuple, None] = None, block_type: str = "fo", is_parallel: bool = False):
         self.name = name
         self.body = body
         self.iterations = iterations  # Can be int, ('var', varname), or None
         self.current_iteration = 0
-        self.status = BlockStatus.STOPPED
+        self.status = BLOCK_STOPPED
         self.block_type = block_type  # "os", "de", "fo"
         self.is_parallel = is_parallel
-        self.thread = None
+        self.future = None  # Pool task running this block when parallel
         self.should_stop = threading.Event()
+        self.tick_interval = PARALLEL_TICK  # Parallel blocks wait this long between iterations
+        self.process_parallel = False  # Parallel DE block runs its kernel in a worker process
+        self.code = None  # Compiled body, built on first run
+        self.kernel = None  # NumericKernel when the body is plain arithmetic
+        self.step = None  # Runs one cooperative iteration; chosen by make_block
 
         # Save/restore functionality
         self.saved_iteration = None
         self.saved_status = None
         self.has_saved_state = False
 
+    def get_code(self):
+        """Return the compiled body, compiling it on first use"""
+        code = self.code
+        if code is None:
+            code = self.code = compile_block(self.body)
+        return code
+
     def reset(self):
         self.current_iteration = 0
-        self.status = BlockStatus.STOPPED
+        self.status = BLOCK_STOPPED
         self.should_stop.clear()
-        if self.thread and self.thread.is_alive():
+        if self.future is not None and not self.future.done():
             self.should_stop.set()
-            self.thread.join(timeout=1.0)
+            concurrent.futures.wait((self.future,), timeout=1.0)
 
     def save_state(self):
         """Save current execution state"""
@@ -80,23 +158,56 @@ class Block:
             return True
         return False
 
+# Block declaration node type -> (block_type, is_parallel)
+BLOCK_KINDS = {
+    OSBlock: ("os", False),
+    ParallelDEBlock: ("de", True),
+    ParallelFOBlock: ("fo", True),
+    DEBlock: ("de", False),
+    FOBlock: ("fo", False),
+}
+
 class Interpreter:
-    def __init__(self, enable_hot_reload=False, source_file=None):
+    def __init__(self, enable_hot_reload=False, source_file=None, jit=False):
         self.global_vars: Dict[str, Any] = {}
         self.functions: Dict[str, FuncDeclaration] = {}
         self.classes: Dict[str, ClassDeclaration] = {}
         self.blocks: Dict[str, Block] = {}
-        self.running_blocks: List[str] = []
+        self.running_blocks: Dict[str, Block] = {}  # Cooperative blocks in start order
+        self._running_snapshot: Optional[tuple] = None  # Rebuilt only when running_blocks changes
         self.exit_requested = False
+        self.min_idle_sleep = 0.001  # Idle main loop backs off from 1ms...
+        self.max_idle_sleep = 0.05  # ...up to 50ms
         self.modules: Dict[str, Any] = {}
         self.module_namespaces: Dict[str, Dict[str, Any]] = {}  # Store module namespaces
         self.function_modules: Dict[str, str] = {}  # Track which module a function belongs to
+        self._import_cache: Dict[tuple, tuple] = {}  # Import decl key -> (module, bindings)
         self.current_module: Optional[str] = None  # Track current executing module
         self.global_vars_lock = threading.Lock()
-        self.parallel_threads: List[threading.Thread] = []
+        # Parallel block threads currently running; variable access only
+        # takes global_vars_lock while there are any (or without a GIL)
+        self.parallel_count = 0
+        self._vars_shared = not _GIL_ENABLED
+        self.parallel_futures: List[concurrent.futures.Future] = []
+        self._thread_pool = None  # Reused threads for parallel blocks, created on first use
+        self._process_pool = None  # Worker processes for process=True blocks, created on first use
         self.hot_reloader = None
         self.enable_hot_reload = enable_hot_reload
         self.source_file = source_file
+        self.jit = jit  # Compile numeric block kernels with numba when available
+
+        # Attach per-node-type handlers to the AST classes
+        _install_dispatch()
+
+        # Top-level declaration type -> registration handler
+        self._decl_handlers = {
+            TupleUnpackingAssignment: self._declare_tuple_unpacking,
+            VarDeclaration: self._declare_var,
+            FuncDeclaration: self._declare_func,
+            ClassDeclaration: self._declare_class,
+            ImportDeclaration: self.handle_import,
+            FromImportDeclaration: self.handle_from_import,
+        }
 
         # Add built-in functions for error handling
         self.setup_builtins()
@@ -410,55 +521,15 @@ class Interpreter:
 
     def interpret(self, program: Program):
         # Process declarations
+        handlers = self._decl_handlers
         for decl in program.declarations:
-            if isinstance(decl, TupleUnpackingAssignment):
-                # Handle tuple unpacking at global level
-                value = self.eval_expression(decl.value)
-                if hasattr(value, '__iter__') and not isinstance(value, str):
-                    values = list(value)
-                else:
-                    raise ValueError(f"Cannot unpack non-iterable {type(value).__name__} value")
-                if len(values) != len(decl.targets):
-                    raise ValueError(f"Too many values to unpack (expected {len(decl.targets)}, got {len(values)})")
-                for target, val in zip(decl.targets, values):
-                    self.global_vars[target] = val
-            elif isinstance(decl, VarDeclaration):
-                self.global_vars[decl.name] = self.eval_expression(decl.value)
-            elif isinstance(decl, FuncDeclaration):
-                self.functions[decl.name] = decl
-            elif isinstance(decl, ClassDeclaration):
-                self.classes[decl.name] = decl
-                # Create a class constructor function with proper closure
-                def make_constructor(class_decl):
-                    return lambda *args, **kwargs: self.instantiate_class(class_decl, args, kwargs)
-                self.global_vars[decl.name] = make_constructor(decl)
-            elif isinstance(decl, ImportDeclaration):
-                self.handle_import(decl)
-            elif isinstance(decl, FromImportDeclaration):
-                self.handle_from_import(decl)
+            handler = handlers.get(type(decl))
+            if handler is not None:
+                handler(decl)
 
-        # Register blocks (check specific types first!)
+        # Register blocks
         for block in program.blocks:
-            if isinstance(block, OSBlock):
-                self.blocks[block.name] = Block(block.name, block.body, None, "os", False)
-            elif isinstance(block, ParallelDEBlock):
-                # Check if iterations is a variable name (stored as string from parser)
-                if isinstance(block.iterations, str):
-                    iterations = ('var', block.iterations)
-                else:
-                    iterations = block.iterations
-                self.blocks[block.name] = Block(block.name, block.body, iterations, "de", True)
-            elif isinstance(block, ParallelFOBlock):
-                self.blocks[block.name] = Block(block.name, block.body, None, "fo", True)
-            elif isinstance(block, DEBlock):
-                # Check if iterations is a variable name (stored as string from parser)
-                if isinstance(block.iterations, str):
-                    iterations = ('var', block.iterations)
-                else:
-                    iterations = block.iterations
-                self.blocks[block.name] = Block(block.name, block.body, iterations, "de", False)
-            else:  # Regular FOBlock
-                self.blocks[block.name] = Block(block.name, block.body, None, "fo", False)
+            self.blocks[block.name] = self.make_block(block)
 
         # Setup hot reload if enabled
         if self.enable_hot_reload and self.source_file:
@@ -478,17 +549,117 @@ class Interpreter:
             # Clean up parallel threads
             self.cleanup_parallel_threads()
 
+    def _declare_tuple_unpacking(self, decl: TupleUnpackingAssignment):
+        # Handle tuple unpacking at global level
+        value = self.eval_expression(decl.value)
+        if hasattr(value, '__iter__') and not isinstance(value, str):
+            values = list(value)
+        else:
+            raise ValueError(f"Cannot unpack non-iterable {type(value).__name__} value")
+        if len(values) != len(decl.targets):
+            raise ValueError(f"Too many values to unpack (expected {len(decl.targets)}, got {len(values)})")
+        for target, val in zip(decl.targets, values):
+            self.global_vars[target] = val
+
+    def _declare_var(self, decl: VarDeclaration):
+        self.global_vars[decl.name] = self.eval_expression(decl.value)
+
+    def _declare_func(self, decl: FuncDeclaration):
+        self.functions[decl.name] = decl
+
+    def _declare_class(self, decl: ClassDeclaration):
+        self.classes[decl.name] = decl
+        # Create a class constructor function with proper closure
+        self.global_vars[decl.name] = lambda *args, **kwargs: self.instantiate_class(decl, args, kwargs)
+
+    def make_block(self, node: ASTNode, name: Optional[str] = None) -> Block:
+        """Create the runtime Block for a block declaration node"""
+        block_type, is_parallel = BLOCK_KINDS.get(type(node), ("fo", False))
+        iterations = None
+        if block_type == "de":
+            iterations = node.iterations
+            # A variable name (stored as string by the parser) is resolved at start
+            if isinstance(iterations, str):
+                iterations = ('var', iterations)
+        block = Block(name or node.name, node.body, iterations, block_type, is_parallel)
+        block.code = compile_node(node)
+        tick = getattr(node, 'tick', None)
+        if tick is not None:
+            block.tick_interval = tick
+        block.process_parallel = is_parallel and getattr(node, 'process', False)
+        # Module blocks resolve names in their namespace, so only top-level
+        # blocks run as kernels over global_vars
+        if '.' not in block.name:
+            block.kernel = compile_kernel(node.body, self.jit)
+
+        # Pick the cooperative step once: module blocks need the module
+        # context switch, the rest are plain forever or counted blocks
+        if '.' in block.name:
+            block.step = self.execute_block_iteration
+        elif iterations is None:
+            block.step = self._step_fo
+        else:
+            block.step = self._step_de
+        return block
+
+    def run_block_body(self, block: Block):
+        """Run one pass of a block body, returning its flow signal"""
+        kernel = block.kernel
+        if kernel is not None and not self.current_module:
+            if self._vars_shared:
+                with self.global_vars_lock:
+                    done = kernel.run(self.global_vars)
+            else:
+                done = kernel.run(self.global_vars)
+            if done:
+                return None
+        return run_code(self, block.get_code())
+
     def execute_main(self, main_block: MainBlock):
+        # A main made only of `when` statements with pure conditions is idle
+        # on a pass where nothing fires and no cooperative block runs; back
+        # off instead of spinning until a parallel block changes something
+        passive = is_passive(main_block.body, self.blocks)
+        idle_sleep = self.min_idle_sleep
+
         while not self.exit_requested:
             try:
                 # Execute main block body
-                self.execute_statements(main_block.body)
+                if passive:
+                    fired = False
+                    flow = None
+                    for stmt in main_block.body:
+                        if self.eval_expression(stmt.condition):
+                            fired = True
+                            flow = self.execute_body(stmt)
+                            if flow is not None:
+                                break
+                else:
+                    flow = self.execute_body(main_block)
+
+                if flow is not None:
+                    if flow == FLOW_CONTINUE:
+                        continue
+                    if flow == FLOW_BREAK:
+                        break
+                    self._escape_flow(flow)
 
                 # Execute one iteration of each running block (cooperative scheduling)
-                for block_name in list(self.running_blocks):
-                    block = self.blocks[block_name]
-                    if block.status == BlockStatus.RUNNING:
-                        self.execute_block_iteration(block)
+                # The snapshot holds the Block objects themselves; hot reload
+                # reschedules a replaced block so the new object is picked up
+                snapshot = self._running_snapshot
+                if snapshot is None:
+                    snapshot = self._running_snapshot = tuple(self.running_blocks.values())
+                for block in snapshot:
+                    if block.status is BLOCK_RUNNING:
+                        block.step(block)
+
+                if passive:
+                    if fired or self.running_blocks:
+                        idle_sleep = self.min_idle_sleep
+                    else:
+                        time.sleep(idle_sleep)
+                        idle_sleep = min(self.max_idle_sleep, idle_sleep * 2)
 
             except ContinueException:
                 continue
@@ -518,8 +689,55 @@ class Interpreter:
         
         return block.iterations
 
+    def _step_fo(self, block: Block):
+        """Run one iteration of a top-level FO block"""
+        try:
+            flow = self.run_block_body(block)
+        except ContinueException:
+            return
+        except BreakException:
+            flow = FLOW_BREAK
+
+        if flow is not None:
+            if flow == FLOW_BREAK:
+                block.status = BLOCK_STOPPED
+                self.unschedule_block(block.name)
+            elif type(flow) is tuple:
+                self._escape_flow(flow)
+
+    def _step_de(self, block: Block):
+        """Run one iteration of a top-level DE block, counting it"""
+        iterations = self.resolve_block_iterations(block)
+        if block.current_iteration >= iterations:
+            block.status = BLOCK_COMPLETED
+            self.unschedule_block(block.name)
+            return
+
+        try:
+            flow = self.run_block_body(block)
+        except ContinueException:
+            flow = None
+        except BreakException:
+            flow = FLOW_BREAK
+
+        if flow is not None:
+            if flow == FLOW_BREAK:
+                # Break stops the block regardless of remaining iterations
+                block.status = BLOCK_STOPPED
+                self.unschedule_block(block.name)
+                return
+            if type(flow) is tuple:
+                self._escape_flow(flow)
+
+        # Continue still counts as an iteration
+        block.current_iteration += 1
+        if block.current_iteration >= iterations:
+            block.status = BLOCK_COMPLETED
+            self.unschedule_block(block.name)
+
     def execute_block_iteration(self, block: Block):
-        if block.status != BlockStatus.RUNNING:
+        """Run one iteration of any block, switching into its module's context"""
+        if block.status is not BLOCK_RUNNING:
             return
 
         # Resolve iterations if needed
@@ -527,9 +745,8 @@ class Interpreter:
 
         # For DE blocks, check if we've already completed all iterations
         if iterations is not None and block.current_iteration >= iterations:
-            block.status = BlockStatus.COMPLETED
-            if block.name in self.running_blocks:
-                self.running_blocks.remove(block.name)
+            block.status = BLOCK_COMPLETED
+            self.unschedule_block(block.name)
             return
 
         try:
@@ -542,420 +759,556 @@ class Interpreter:
                     self.current_module = module_name
 
             # Execute one iteration
-            self.execute_statements(block.body)
+            flow = self.run_block_body(block)
+
+            if flow == FLOW_BREAK:
+                # Break stops the block regardless of remaining iterations
+                block.status = BLOCK_STOPPED
+                self.unschedule_block(block.name)
+                return
+            if type(flow) is tuple:
+                self._escape_flow(flow)
 
             # Increment iteration counter AFTER successful execution
+            # (continue still counts as an iteration)
             if iterations is not None:
                 block.current_iteration += 1
                 # Check if we've now completed all iterations
                 if block.current_iteration >= iterations:
-                    block.status = BlockStatus.COMPLETED
-                    if block.name in self.running_blocks:
-                        self.running_blocks.remove(block.name)
+                    block.status = BLOCK_COMPLETED
+                    self.unschedule_block(block.name)
 
         except ContinueException:
             # Continue still counts as an iteration
             if iterations is not None:
                 block.current_iteration += 1
                 if block.current_iteration >= iterations:
-                    block.status = BlockStatus.COMPLETED
-                    if block.name in self.running_blocks:
-                        self.running_blocks.remove(block.name)
+                    block.status = BLOCK_COMPLETED
+                    self.unschedule_block(block.name)
         except BreakException:
             # Break stops the block regardless of remaining iterations
-            block.status = BlockStatus.STOPPED
-            if block.name in self.running_blocks:
-                self.running_blocks.remove(block.name)
+            block.status = BLOCK_STOPPED
+            self.unschedule_block(block.name)
         finally:
             # Restore module context
             if '.' in block.name:
                 self.current_module = saved_module
 
     def execute_statements(self, statements: List[Statement]):
+        """Run statements, returning the first flow signal (None if none)"""
         for stmt in statements:
-            self.execute_statement(stmt)
+            flow = stmt._exec(self, stmt)
+            if flow is not None:
+                return flow
+        return None
+
+    def execute_body(self, node: ASTNode):
+        """Run the body of a main/function/when/with node from its compiled code"""
+        code = node._code
+        if code is None:
+            code = compile_node(node)
+        for handler, stmt in code:
+            flow = handler(self, stmt)
+            if flow is not None:
+                return flow
+        return None
 
     def execute_statement(self, stmt: Statement):
-        if isinstance(stmt, ExpressionStatement):
-            self.eval_expression(stmt.expr)
-        elif isinstance(stmt, TupleUnpackingAssignment):
-            # Handle tuple unpacking: a, b, c = expr
-            value = self.eval_expression(stmt.value)
-
-            # Convert value to list/tuple if it's iterable
-            if hasattr(value, '__iter__') and not isinstance(value, str):
-                values = list(value)
-            else:
-                raise ValueError(f"Cannot unpack non-iterable {type(value).__name__} value")
+        return stmt._exec(self, stmt)
 
-            # Check length match
-            if len(values) != len(stmt.targets):
-                raise ValueError(f"Too many values to unpack (expected {len(stmt.targets)}, got {len(values)})")
+    def _escape_flow(self, flow):
+        """Raise a flow signal that leaves the body it was signalled in.
 
-            # Assign each value to corresponding target
-            with self.global_vars_lock:
-                for target, val in zip(stmt.targets, values):
-                    if self.current_module and self.current_module in self.module_namespaces:
-                        self.module_namespaces[self.current_module][target] = val
-                        if self.current_module in self.modules:
-                            setattr(self.modules[self.current_module], target, val)
-                    else:
-                        self.global_vars[target] = val
-        elif isinstance(stmt, Assignment):
-            value = self.eval_expression(stmt.value)
-            with self.global_vars_lock:
-                # In module context, ALL assignments go to module namespace
-                # (including those marked global - they're global TO THE MODULE)
+        break/continue inside a function (or a block called like one) and
+        return inside a called block act on the enclosing loop or function;
+        only that rare path still travels as an exception.
+        """
+        if flow is None:
+            return
+        if flow == FLOW_BREAK:
+            raise BreakException()
+        if flow == FLOW_CONTINUE:
+            raise ContinueException()
+        raise ReturnException(flow[1])
+
+    def _function_result(self, flow) -> Any:
+        """Turn the flow signal that ended a function body into its result"""
+        if flow is None:
+            return None
+        if type(flow) is tuple:
+            return flow[1]
+        self._escape_flow(flow)
+
+    def eval_expression(self, expr: Expression) -> Any:
+        return expr._eval(self, expr)
+
+    def _exec_unknown(self, stmt: ASTNode):
+        # Nodes without a statement handler are ignored
+        pass
+
+    def _eval_unknown(self, expr: ASTNode) -> Any:
+        raise NotImplementedError(f"Expression type {type(expr)} not implemented")
+
+    def _exec_expression_statement(self, stmt: ExpressionStatement):
+        self.eval_expression(stmt.expr)
+
+    def _exec_tuple_unpacking_assignment(self, stmt: TupleUnpackingAssignment):
+        # Handle tuple unpacking: a, b, c = expr
+        value = self.eval_expression(stmt.value)
+
+        # Convert value to list/tuple if it's iterable
+        if hasattr(value, '__iter__') and not isinstance(value, str):
+            values = list(value)
+        else:
+            raise ValueError(f"Cannot unpack non-iterable {type(value).__name__} value")
+
+        # Check length match
+        if len(values) != len(stmt.targets):
+            raise ValueError(f"Too many values to unpack (expected {len(stmt.targets)}, got {len(values)})")
+
+        # Assign each value to corresponding target
+        with self.global_vars_lock:
+            for target, val in zip(stmt.targets, values):
                 if self.current_module and self.current_module in self.module_namespaces:
-                    # print(f"[DEBUG] Updating module '{self.current_module}' var '{stmt.name}' = {value}")
-                    self.module_namespaces[self.current_module][stmt.name] = value
-                    # Also update the module object if it exists
+                    self.module_namespaces[self.current_module][target] = val
                     if self.current_module in self.modules:
-                        setattr(self.modules[self.current_module], stmt.name, value)
+                        setattr(self.modules[self.current_module], target, val)
                 else:
-                    # Otherwise use interpreter global scope
-                    # print(f"[DEBUG] Updating global var '{stmt.name}' = {value} (module: {self.current_module})")
-                    self.global_vars[stmt.name] = value
-        elif isinstance(stmt, IndexAssignment):
-            obj = self.eval_expression(stmt.object)
-            index = self.eval_expression(stmt.index)
-            value = self.eval_expression(stmt.value)
-            obj[index] = value
-        elif isinstance(stmt, AttributeAssignment):
-            obj = self.eval_expression(stmt.object)
-            value = self.eval_expression(stmt.value)
-            # Set the attribute on the object
-            setattr(obj, stmt.attribute, value)
-        elif isinstance(stmt, WhenStatement):
-            condition_result = self.eval_expression(stmt.condition)
-            if condition_result:
-                self.execute_statements(stmt.body)
-        elif isinstance(stmt, WithStatement):
-            # Execute with statement (context manager)
-            context = self.eval_expression(stmt.context_expr)
-
-            # Check if it has __enter__ and __exit__ methods
-            if hasattr(context, '__enter__') and hasattr(context, '__exit__'):
-                # Use the context manager protocol
-                value = context.__enter__()
-
-                # Store in variable if 'as' clause is present
-                if stmt.var_name:
-                    with self.global_vars_lock:
-                        if self.current_module and self.current_module in self.module_namespaces:
-                            self.module_namespaces[self.current_module][stmt.var_name] = value
-                        else:
-                            self.global_vars[stmt.var_name] = value
+                    self.global_vars[target] = val
 
-                try:
-                    # Execute the body
-                    self.execute_statements(stmt.body)
-                except Exception as e:
-                    # Call __exit__ with exception info
-                    if not context.__exit__(type(e), e, None):
-                        raise
-                else:
-                    # Call __exit__ with no exception
-                    context.__exit__(None, None, None)
+    def _exec_assignment(self, stmt: Assignment):
+        value = self.eval_expression(stmt.value)
+        if not self._vars_shared and not self.current_module:
+            # Single writer: a dict store is atomic under the GIL
+            self.global_vars[stmt.name] = value
+            return
+        with self.global_vars_lock:
+            # In module context, ALL assignments go to module namespace
+            # (including those marked global - they're global TO THE MODULE)
+            if self.current_module and self.current_module in self.module_namespaces:
+                # print(f"[DEBUG] Updating module '{self.current_module}' var '{stmt.name}' = {value}")
+                self.module_namespaces[self.current_module][stmt.name] = value
+                # Also update the module object if it exists
+                if self.current_module in self.modules:
+                    setattr(self.modules[self.current_module], stmt.name, value)
             else:
-                # Simple assignment without context manager protocol
-                if stmt.var_name:
-                    with self.global_vars_lock:
-                        if self.current_module and self.current_module in self.module_namespaces:
-                            self.module_namespaces[self.current_module][stmt.var_name] = context
-                        else:
-                            self.global_vars[stmt.var_name] = context
+                # Otherwise use interpreter global scope
+                # print(f"[DEBUG] Updating global var '{stmt.name}' = {value} (module: {self.current_module})")
+                self.global_vars[stmt.name] = value
+
+    def _exec_index_assignment(self, stmt: IndexAssignment):
+        obj = self.eval_expression(stmt.object)
+        index = self.eval_expression(stmt.index)
+        value = self.eval_expression(stmt.value)
+        obj[index] = value
+
+    def _exec_attribute_assignment(self, stmt: AttributeAssignment):
+        obj = self.eval_expression(stmt.object)
+        value = self.eval_expression(stmt.value)
+        # Set the attribute on the object
+        setattr(obj, stmt.attribute, value)
+
+    def _exec_when(self, stmt: WhenStatement):
+        condition_result = self.eval_expression(stmt.condition)
+        if condition_result:
+            return self.execute_body(stmt)
+
+    def _exec_with(self, stmt: WithStatement):
+        # Execute with statement (context manager)
+        context = self.eval_expression(stmt.context_expr)
+
+        # Check if it has __enter__ and __exit__ methods
+        if hasattr(context, '__enter__') and hasattr(context, '__exit__'):
+            # Use the context manager protocol
+            value = context.__enter__()
+
+            # Store in variable if 'as' clause is present
+            if stmt.var_name:
+                with self.global_vars_lock:
+                    if self.current_module and self.current_module in self.module_namespaces:
+                        self.module_namespaces[self.current_module][stmt.var_name] = value
+                    else:
+                        self.global_vars[stmt.var_name] = value
+
+            try:
                 # Execute the body
-                self.execute_statements(stmt.body)
-        elif isinstance(stmt, BreakStatement):
-            raise BreakException()
-        elif isinstance(stmt, ContinueStatement):
-            raise ContinueException()
-        elif isinstance(stmt, ExitStatement):
-            self.exit_requested = True
-            raise ExitException()
-        elif isinstance(stmt, PassStatement):
-            pass
-        elif isinstance(stmt, ReturnStatement):
-            if len(stmt.values) == 0:
-                value = None
-            elif len(stmt.values) == 1:
-                value = self.eval_expression(stmt.values[0])
+                flow = self.execute_body(stmt)
+            except Exception as e:
+                # Call __exit__ with exception info
+                if not context.__exit__(type(e), e, None):
+                    raise
             else:
-                # Multiple return values - return as tuple
-                value = tuple(self.eval_expression(val) for val in stmt.values)
-            raise ReturnException(value)
-        elif isinstance(stmt, GlobalStatement):
-            # Global statements mark variables as global in local scope
-            # Store the global declaration for function context
-            for name in stmt.names:
-                if not hasattr(self, 'current_globals'):
-                    self.current_globals = set()
-                self.current_globals.add(name)
+                # Call __exit__ with no exception
+                context.__exit__(None, None, None)
+                return flow
+        else:
+            # Simple assignment without context manager protocol
+            if stmt.var_name:
+                with self.global_vars_lock:
+                    if self.current_module and self.current_module in self.module_namespaces:
+                        self.module_namespaces[self.current_module][stmt.var_name] = context
+                    else:
+                        self.global_vars[stmt.var_name] = context
+            # Execute the body
+            return self.execute_body(stmt)
 
-    def eval_expression(self, expr: Expression) -> Any:
-        if isinstance(expr, NumberLiteral):
-            return expr.value
-        elif isinstance(expr, StringLiteral):
-            return expr.value
-        elif isinstance(expr, FStringLiteral):
-            return self.eval_fstring(expr)
-        elif isinstance(expr, BooleanLiteral):
-            return expr.value
-        elif isinstance(expr, NoneLiteral):
-            return None
-        elif isinstance(expr, ListLiteral):
-            return [self.eval_expression(elem) for elem in expr.elements]
-        elif isinstance(expr, TupleLiteral):
-            return tuple(self.eval_expression(elem) for elem in expr.elements)
-        elif isinstance(expr, DictLiteral):
-            return {self.eval_expression(k): self.eval_expression(v)
-                    for k, v in zip(expr.keys, expr.values)}
-        elif isinstance(expr, SliceExpression):
-            obj = self.eval_expression(expr.object)
-            start = self.eval_expression(expr.start) if expr.start else None
-            stop = self.eval_expression(expr.stop) if expr.stop else None
-            step = self.eval_expression(expr.step) if expr.step else None
+    def _exec_break(self, stmt: BreakStatement):
+        return FLOW_BREAK
 
-            if step is not None:
-                return obj[start:stop:step]
-            else:
-                return obj[start:stop]
-        elif isinstance(expr, IndexExpression):
-            obj = self.eval_expression(expr.object)
-            index = self.eval_expression(expr.index)
-            return obj[index]
-        elif isinstance(expr, UnaryOp):
-            operand = self.eval_expression(expr.operand)
-            if expr.operator == '-':
-                return -operand
-            elif expr.operator == 'not':
-                return not operand
-            else:
-                raise NotImplementedError(f"Unary operator {expr.operator} not implemented")
-        elif isinstance(expr, TernaryOp):
-            condition = self.eval_expression(expr.condition)
-            if condition:
-                return self.eval_expression(expr.true_expr)
-            else:
-                return self.eval_expression(expr.false_expr)
-        elif isinstance(expr, Identifier):
+    def _exec_continue(self, stmt: ContinueStatement):
+        return FLOW_CONTINUE
+
+    def _exec_exit(self, stmt: ExitStatement):
+        self.exit_requested = True
+        raise ExitException()
+
+    def _exec_pass(self, stmt: PassStatement):
+        pass
+
+    def _exec_return(self, stmt: ReturnStatement):
+        if len(stmt.values) == 0:
+            value = None
+        elif len(stmt.values) == 1:
+            value = self.eval_expression(stmt.values[0])
+        else:
+            # Multiple return values - return as tuple
+            value = tuple(self.eval_expression(val) for val in stmt.values)
+        return (FLOW_RETURN, value)
+
+    def _exec_global(self, stmt: GlobalStatement):
+        # Global statements mark variables as global in local scope
+        # Store the global declaration for function context
+        for name in stmt.names:
+            if not hasattr(self, 'current_globals'):
+                self.current_globals = set()
+            self.current_globals.add(name)
+
+    def _eval_number_literal(self, expr: NumberLiteral) -> Any:
+        return expr.value
+
+    def _eval_string_literal(self, expr: StringLiteral) -> Any:
+        return expr.value
+
+    def _eval_fstring_literal(self, expr: FStringLiteral) -> Any:
+        return self.eval_fstring(expr)
+
+    def _eval_boolean_literal(self, expr: BooleanLiteral) -> Any:
+        return expr.value
+
+    def _eval_none_literal(self, expr: NoneLiteral) -> Any:
+        return None
+
+    def _eval_list_literal(self, expr: ListLiteral) -> Any:
+        return [self.eval_expression(elem) for elem in expr.elements]
+
+    def _eval_tuple_literal(self, expr: TupleLiteral) -> Any:
+        return tuple(self.eval_expression(elem) for elem in expr.elements)
+
+    def _eval_dict_literal(self, expr: DictLiteral) -> Any:
+        return {self.eval_expression(k): self.eval_expression(v)
+                for k, v in zip(expr.keys, expr.values)}
+
+    def _eval_slice(self, expr: SliceExpression) -> Any:
+        obj = self.eval_expression(expr.object)
+        start = self.eval_expression(expr.start) if expr.start else None
+        stop = self.eval_expression(expr.stop) if expr.stop else None
+        step = self.eval_expression(expr.step) if expr.step else None
+
+        if step is not None:
+            return obj[start:stop:step]
+        else:
+            return obj[start:stop]
+
+    def _eval_index(self, expr: IndexExpression) -> Any:
+        obj = self.eval_expression(expr.object)
+        index = self.eval_expression(expr.index)
+        return obj[index]
+
+    def _eval_unary_op(self, expr: UnaryOp) -> Any:
+        op_fn = expr._op_fn
+        if op_fn is None:
+            # Not seen by the compiler (e.g. global declarations)
+            op_fn = expr._op_fn = resolve_unary_op(expr.operator)
+        return op_fn(self.eval_expression(expr.operand))
+
+    def _eval_ternary_op(self, expr: TernaryOp) -> Any:
+        condition = self.eval_expression(expr.condition)
+        if condition:
+            return self.eval_expression(expr.true_expr)
+        else:
+            return self.eval_expression(expr.false_expr)
+
+    def _eval_identifier(self, expr: Identifier) -> Any:
+        # Names are interned by the lexer, so each probe is one hash-cached lookup
+        name = expr.name
+        if not self._vars_shared and not self.current_module:
+            # Single writer: a dict read is atomic under the GIL
+            value = self.global_vars.get(name, _MISSING)
+            if value is not _MISSING:
+                return value
+        else:
             with self.global_vars_lock:
                 # If in module context, check module namespace first
-                if self.current_module and self.current_module in self.module_namespaces:
-                    if expr.name in self.module_namespaces[self.current_module]:
-                        return self.module_namespaces[self.current_module][expr.name]
+                if self.current_module:
+                    namespace = self.module_namespaces.get(self.current_module)
+                    if namespace is not None:
+                        value = namespace.get(name, _MISSING)
+                        if value is not _MISSING:
+                            return value
                 # Then check global vars
-                if expr.name in self.global_vars:
-                    return self.global_vars[expr.name]
-            # Check if it's a function name being referenced
-            if expr.name in self.functions:
-                # Return a callable wrapper for WHEN functions
-                func = self.functions[expr.name]
-                def when_function_wrapper(*args, **kwargs):
-                    # Convert args to Expression objects if they're not already
-                    arg_exprs = []
-                    for arg in args:
-                        if hasattr(arg, '__dict__') and hasattr(arg, 'type'):
-                            # This is likely a tkinter event object - pass it through
-                            # Create a special identifier that resolves to this object
-                            from ast_nodes import Identifier
+                value = self.global_vars.get(name, _MISSING)
+                if value is not _MISSING:
+                    return value
+        # Check if it's a function name being referenced
+        if expr.name in self.functions:
+            # Return a callable wrapper for WHEN functions
+            func = self.functions[expr.name]
+            def when_function_wrapper(*args, **kwargs):
+                # Convert args to Expression objects if they're not already
+                arg_exprs = []
+                for arg in args:
+                    if hasattr(arg, '__dict__') and hasattr(arg, 'type'):
+                        # This is likely a tkinter event object - pass it through
+                        # Create a special identifier that resolves to this object
+                        from ast_nodes import Identifier
+                        temp_var_name = f"_temp_arg_{id(arg)}"
+                        self.global_vars[temp_var_name] = arg
+                        arg_exprs.append(Identifier(temp_var_name))
+                    else:
+                        # Regular value - wrap in a literal expression
+                        from ast_nodes import NumberLiteral, StringLiteral, BooleanLiteral
+                        if isinstance(arg, (int, float)):
+                            arg_exprs.append(NumberLiteral(arg))
+                        elif isinstance(arg, str):
+                            arg_exprs.append(StringLiteral(arg))
+                        elif isinstance(arg, bool):
+                            arg_exprs.append(BooleanLiteral(arg))
+                        else:
+                            # Store as temporary variable
                             temp_var_name = f"_temp_arg_{id(arg)}"
                             self.global_vars[temp_var_name] = arg
                             arg_exprs.append(Identifier(temp_var_name))
-                        else:
-                            # Regular value - wrap in a literal expression
-                            from ast_nodes import NumberLiteral, StringLiteral, BooleanLiteral
-                            if isinstance(arg, (int, float)):
-                                arg_exprs.append(NumberLiteral(arg))
-                            elif isinstance(arg, str):
-                                arg_exprs.append(StringLiteral(arg))
-                            elif isinstance(arg, bool):
-                                arg_exprs.append(BooleanLiteral(arg))
-                            else:
-                                # Store as temporary variable
-                                temp_var_name = f"_temp_arg_{id(arg)}"
-                                self.global_vars[temp_var_name] = arg
-                                arg_exprs.append(Identifier(temp_var_name))
-
-                    return self.call_function(expr.name, arg_exprs, [])
-                return when_function_wrapper
-            raise NameError(f"Variable '{expr.name}' not defined")
-        elif isinstance(expr, BinaryOp):
-            left = self.eval_expression(expr.left)
-            right = self.eval_expression(expr.right)
-            return self.apply_binary_op(left, expr.operator, right)
-        elif isinstance(expr, CallExpression):
-            return self.call_function(expr.name, expr.args, expr.kwargs)
-        elif isinstance(expr, StartExpression):
-            self.start_block(expr.block_name)
-            return None
-        elif isinstance(expr, StopExpression):
-            self.stop_block(expr.block_name)
-            return None
-        elif isinstance(expr, SaveExpression):
-            self.save_block(expr.block_name)
-            return None
-        elif isinstance(expr, SaveStopExpression):
-            self.save_stop_block(expr.block_name)
-            return None
-        elif isinstance(expr, StartSaveExpression):
-            self.start_save_block(expr.block_name)
-            return None
-        elif isinstance(expr, DiscardExpression):
-            self.discard_block(expr.block_name)
-            return None
-        elif isinstance(expr, MemberAccess):
-            # Special handling for block property access
-            if isinstance(expr.object, Identifier) and expr.object.name in self.blocks:
-                block = self.blocks[expr.object.name]
-                if expr.member == "current_iteration":
-                    return block.current_iteration
-                elif expr.member == "status":
-                    return block.status.name
-                elif expr.member == "iterations":
-                    return self.resolve_block_iterations(block)
-                elif expr.member == "has_saved_state":
-                    return block.has_saved_state
-                else:
-                    raise AttributeError(f"Block '{expr.object.name}' has no attribute '{expr.member}'")
-            else:
-                obj = self.eval_expression(expr.object)
-                attr = getattr(obj, expr.member)
-                # If it's a FuncDeclaration from a module, return a callable wrapper
-                if isinstance(attr, FuncDeclaration):
-                    # Store it in functions so it can be called
-                    func_name = f"{expr.object.name if isinstance(expr.object, Identifier) else 'module'}.{expr.member}"
-                    self.functions[func_name] = attr
-                    # Return the function name so CallExpression can find it
-                    return func_name
-                return attr
-        elif isinstance(expr, MethodCall):
-            # DEBUG
-            # if expr.method == "is_key_pressed":
-            #     print(f"[DEBUG MethodCall] is_key_pressed args={expr.args}, first arg={expr.args[0] if expr.args else None}")
-            # Check if this is a block method from a module
-            if isinstance(expr.object, MemberAccess):
-                # It might be module.block.start()
-                module_obj = self.eval_expression(expr.object.object)
-                attr = getattr(module_obj, expr.object.member)
-                if isinstance(attr, Block):
-                    # It's a block method call
-                    if expr.method == "start":
-                        self.start_block(attr.name)
-                        return None
-                    elif expr.method == "stop":
-                        self.stop_block(attr.name)
-                        return None
-                    else:
-                        raise AttributeError(f"Block has no method '{expr.method}'")
 
+                return self.call_function(expr.name, arg_exprs, [])
+            return when_function_wrapper
+        raise NameError(f"Variable '{expr.name}' not defined")
+
+    def _eval_binary_op(self, expr: BinaryOp) -> Any:
+        op_fn = expr._op_fn
+        if op_fn is None:
+            # Not seen by the compiler (e.g. global declarations)
+            op_fn = expr._op_fn = resolve_binary_op(expr.operator)
+        return op_fn(self.eval_expression(expr.left), self.eval_expression(expr.right))
+
+    def _eval_call(self, expr: CallExpression) -> Any:
+        if not self.current_module:
+            # Outside modules nothing can shadow a builtin, so use the
+            # compile-time classification and skip the name checks
+            builtin = expr._builtin
+            if builtin is None:
+                builtin = expr._builtin = expr.name in BUILTIN_CALLS
+            if builtin:
+                return BUILTIN_HANDLERS[expr.name](self, expr.args)
+            return self._call_named(expr.name, expr.args, expr.kwargs)
+        return self.call_function(expr.name, expr.args, expr.kwargs)
+
+    def _eval_start(self, expr: StartExpression) -> Any:
+        self.start_block(expr.block_name)
+        return None
+
+    def _eval_stop(self, expr: StopExpression) -> Any:
+        self.stop_block(expr.block_name)
+        return None
+
+    def _eval_save(self, expr: SaveExpression) -> Any:
+        self.save_block(expr.block_name)
+        return None
+
+    def _eval_save_stop(self, expr: SaveStopExpression) -> Any:
+        self.save_stop_block(expr.block_name)
+        return None
+
+    def _eval_start_save(self, expr: StartSaveExpression) -> Any:
+        self.start_save_block(expr.block_name)
+        return None
+
+    def _eval_discard(self, expr: DiscardExpression) -> Any:
+        self.discard_block(expr.block_name)
+        return None
+
+    def _eval_member_access(self, expr: MemberAccess) -> Any:
+        # Special handling for block property access
+        if type(expr.object) is Identifier and expr.object.name in self.blocks:
+            block = self.blocks[expr.object.name]
+            if expr.member == "current_iteration":
+                return block.current_iteration
+            elif expr.member == "status":
+                return block.status.name
+            elif expr.member == "iterations":
+                return self.resolve_block_iterations(block)
+            elif expr.member == "has_saved_state":
+                return block.has_saved_state
+            else:
+                raise AttributeError(f"Block '{expr.object.name}' has no attribute '{expr.member}'")
+        else:
             obj = self.eval_expression(expr.object)
-
-            # If obj is a Block, handle its methods
-            if isinstance(obj, Block):
+            attr = getattr(obj, expr.member)
+            # If it's a FuncDeclaration from a module, return a callable wrapper
+            if type(attr) is FuncDeclaration:
+                # Store it in functions so it can be called
+                func_name = f"{expr.object.name if type(expr.object) is Identifier else 'module'}.{expr.member}"
+                self.functions[func_name] = attr
+                # Return the function name so CallExpression can find it
+                return func_name
+            return attr
+
+    def _eval_method_call(self, expr: MethodCall) -> Any:
+        # DEBUG
+        # if expr.method == "is_key_pressed":
+        #     print(f"[DEBUG MethodCall] is_key_pressed args={expr.args}, first arg={expr.args[0] if expr.args else None}")
+        # Check if this is a block method from a module
+        if type(expr.object) is MemberAccess:
+            # It might be module.block.start()
+            module_obj = self.eval_expression(expr.object.object)
+            attr = getattr(module_obj, expr.object.member)
+            if type(attr) is Block:
+                # It's a block method call
                 if expr.method == "start":
-                    self.start_block(obj.name)
+                    self.start_block(attr.name)
                     return None
                 elif expr.method == "stop":
-                    self.stop_block(obj.name)
+                    self.stop_block(attr.name)
                     return None
                 else:
                     raise AttributeError(f"Block has no method '{expr.method}'")
 
-            method = getattr(obj, expr.method)
+        obj = self.eval_expression(expr.object)
+
+        # Inline cache: same object type as last time, call the cached method
+        if type(obj) is expr._cached_type:
+            args, kwargs = self._method_call_args(expr)
+            return expr._cached_func(obj, *args, **kwargs)
+
+        # If obj is a Block, handle its methods
+        if type(obj) is Block:
+            if expr.method == "start":
+                self.start_block(obj.name)
+                return None
+            elif expr.method == "stop":
+                self.stop_block(obj.name)
+                return None
+            else:
+                raise AttributeError(f"Block has no method '{expr.method}'")
 
-            # If the method is a FuncDeclaration from a module, call it properly
-            if isinstance(method, FuncDeclaration):
-                # Create a qualified name for the function
-                if isinstance(expr.object, Identifier):
-                    func_name = f"{expr.object.name}.{expr.method}"
-                else:
-                    func_name = expr.method
-
-                # Register the function if needed
-                if func_name not in self.functions:
-                    self.functions[func_name] = method
-                    # Track its module if the object is a module
-                    if isinstance(expr.object, Identifier) and expr.object.name in self.modules:
-                        self.function_modules[func_name] = expr.object.name
-
-                # Call it through our function call mechanism
-                # print(f"[DEBUG] Calling function '{func_name}' via MethodCall")
-                return self.call_function(func_name, expr.args, expr.kwargs)
-
-            # Regular method call
-            args = []
-            for arg in expr.args:
-                arg_value = self.eval_expression(arg)
-                # Wrap FuncDeclaration objects in Python callables for tkinter compatibility
-                if isinstance(arg_value, FuncDeclaration):
-                    # Create a wrapper that tkinter can call
-                    def make_wrapper(func_decl, interpreter):
-                        def wrapper(event=None):
-                            # When functions expect an event parameter
-                            # We need to pass it as a variable, not an argument
-                            func_name = func_decl.name
-
-                            # Save current event if exists
-                            saved_event = None
-                            for fname, mod in interpreter.function_modules.items():
-                                if fname.endswith(f".{func_name}") or fname == func_name:
-                                    # Function belongs to a module
+        method = getattr(obj, expr.method)
+
+        # If the method is a FuncDeclaration from a module, call it properly
+        if type(method) is FuncDeclaration:
+            # Create a qualified name for the function
+            if type(expr.object) is Identifier:
+                func_name = f"{expr.object.name}.{expr.method}"
+            else:
+                func_name = expr.method
+
+            # Register the function if needed
+            if func_name not in self.functions:
+                self.functions[func_name] = method
+                # Track its module if the object is a module
+                if type(expr.object) is Identifier and expr.object.name in self.modules:
+                    self.function_modules[func_name] = expr.object.name
+
+            # Call it through our function call mechanism
+            # print(f"[DEBUG] Calling function '{func_name}' via MethodCall")
+            return self.call_function(func_name, expr.args, expr.kwargs)
+
+        # Regular method call
+        args, kwargs = self._method_call_args(expr)
+
+        # Remember the class-level method for objects without an instance
+        # dict (lists, dicts, strings...), where nothing can shadow it. Only
+        # when the attribute really is that function bound to obj: a
+        # staticmethod or classmethod must not be called as func(obj, ...)
+        if not hasattr(obj, '__dict__'):
+            func = getattr(type(obj), expr.method, None)
+            if (type(func) in CACHEABLE_METHODS
+                    and getattr(method, '__self__', None) is obj
+                    and getattr(method, '__func__', func) is func):
+                expr._cached_type = type(obj)
+                expr._cached_func = func
+
+        return method(*args, **kwargs)
+
+    def _method_call_args(self, expr: MethodCall):
+        """Evaluate a method call's positional and keyword arguments"""
+        args = []
+        for arg in expr.args:
+            arg_value = self.eval_expression(arg)
+            # Wrap FuncDeclaration objects in Python callables for tkinter compatibility
+            if type(arg_value) is FuncDeclaration:
+                # Create a wrapper that tkinter can call
+                def make_wrapper(func_decl, interpreter):
+                    def wrapper(event=None):
+                        # When functions expect an event parameter
+                        # We need to pass it as a variable, not an argument
+                        func_name = func_decl.name
+
+                        # Save current event if exists
+                        saved_event = None
+                        for fname, mod in interpreter.function_modules.items():
+                            if fname.endswith(f".{func_name}") or fname == func_name:
+                                # Function belongs to a module
+                                if mod in interpreter.module_namespaces:
+                                    if 'event' in interpreter.module_namespaces[mod]:
+                                        saved_event = interpreter.module_namespaces[mod]['event']
+                                    # Set event in module namespace
+                                    if event:
+                                        interpreter.module_namespaces[mod]['event'] = event
+
+                                old_module = interpreter.current_module
+                                interpreter.current_module = mod
+                                try:
+                                    # Call function - it will access event from module namespace
+                                    from ast_nodes import Identifier, MemberAccess
+                                    # Create an expression that represents the event parameter
+                                    event_expr = Identifier('event') if event else None
+                                    args = [event_expr] if event_expr and func_decl.params and len(func_decl.params) > 0 else []
+                                    result = interpreter.call_function(fname, args)
+                                finally:
+                                    interpreter.current_module = old_module
+                                    # Restore saved event
                                     if mod in interpreter.module_namespaces:
-                                        if 'event' in interpreter.module_namespaces[mod]:
-                                            saved_event = interpreter.module_namespaces[mod]['event']
-                                        # Set event in module namespace
-                                        if event:
-                                            interpreter.module_namespaces[mod]['event'] = event
-
-                                    old_module = interpreter.current_module
-                                    interpreter.current_module = mod
-                                    try:
-                                        # Call function - it will access event from module namespace
-                                        from ast_nodes import Identifier, MemberAccess
-                                        # Create an expression that represents the event parameter
-                                        event_expr = Identifier('event') if event else None
-                                        args = [event_expr] if event_expr and func_decl.params and len(func_decl.params) > 0 else []
-                                        result = interpreter.call_function(fname, args)
-                                    finally:
-                                        interpreter.current_module = old_module
-                                        # Restore saved event
-                                        if mod in interpreter.module_namespaces:
-                                            if saved_event is not None:
-                                                interpreter.module_namespaces[mod]['event'] = saved_event
-                                            elif 'event' in interpreter.module_namespaces[mod] and event:
-                                                del interpreter.module_namespaces[mod]['event']
-                                    return result
-
-                            # If not found in modules, try global
-                            if 'event' in interpreter.global_vars:
-                                saved_event = interpreter.global_vars['event']
-                            if event:
-                                interpreter.global_vars['event'] = event
-                            try:
-                                from ast_nodes import Identifier
-                                event_expr = Identifier('event') if event else None
-                                args = [event_expr] if event_expr and func_decl.params and len(func_decl.params) > 0 else []
-                                return interpreter.call_function(func_name, args)
-                            finally:
-                                if saved_event is not None:
-                                    interpreter.global_vars['event'] = saved_event
-                                elif 'event' in interpreter.global_vars and event:
-                                    del interpreter.global_vars['event']
-                        return wrapper
-                    arg_value = make_wrapper(arg_value, self)
-                args.append(arg_value)
-
-            # Handle keyword arguments
-            kwargs = {}
-            if expr.kwargs:
-                for kw in expr.kwargs:
-                    kwargs[kw.name] = self.eval_expression(kw.value)
-
-            return method(*args, **kwargs)
-        else:
-            raise NotImplementedError(f"Expression type {type(expr)} not implemented")
+                                        if saved_event is not None:
+                                            interpreter.module_namespaces[mod]['event'] = saved_event
+                                        elif 'event' in interpreter.module_namespaces[mod] and event:
+                                            del interpreter.module_namespaces[mod]['event']
+                                return result
+
+                        # If not found in modules, try global
+                        if 'event' in interpreter.global_vars:
+                            saved_event = interpreter.global_vars['event']
+                        if event:
+                            interpreter.global_vars['event'] = event
+                        try:
+                            from ast_nodes import Identifier
+                            event_expr = Identifier('event') if event else None
+                            args = [event_expr] if event_expr and func_decl.params and len(func_decl.params) > 0 else []
+                            return interpreter.call_function(func_name, args)
+                        finally:
+                            if saved_event is not None:
+                                interpreter.global_vars['event'] = saved_event
+                            elif 'event' in interpreter.global_vars and event:
+                                del interpreter.global_vars['event']
+                    return wrapper
+                arg_value = make_wrapper(arg_value, self)
+            args.append(arg_value)
+
+        # Handle keyword arguments
+        kwargs = {}
+        if expr.kwargs:
+            for kw in expr.kwargs:
+                kwargs[kw.name] = self.eval_expression(kw.value)
+
+        return args, kwargs
 
     def eval_fstring(self, fstring: FStringLiteral) -> str:
         """Evaluate an f-string by processing its parts"""
@@ -988,46 +1341,6 @@ class Interpreter:
 
         return result
 
-    def apply_binary_op(self, left: Any, op: str, right: Any) -> Any:
-        if op == '+':
-            return left + right  # Works for numbers AND strings!
-        elif op == '-':
-            return left - right
-        elif op == '*':
-            return left * right
-        elif op == '/':
-            return left / right
-        elif op == '//':
-            return int(left // right)
-        elif op == '%':
-            return left % right
-        elif op == '==' or op == 'eq':
-            return left == right
-        elif op == '!=' or op == 'ne':
-            return left != right
-        elif op == '<' or op == 'lt':
-            return left < right
-        elif op == '>' or op == 'gt':
-            return left > right
-        elif op == '<=' or op == 'le':
-            return left <= right
-        elif op == '>=' or op == 'ge':
-            return left >= right
-        elif op == 'and':
-            return left and right
-        elif op == 'or':
-            return left or right
-        elif op == 'in':
-            return left in right
-        elif op == 'not in':
-            return left not in right
-        elif op == 'is':
-            return left is right
-        elif op == 'is not':
-            return left is not right
-        else:
-            raise NotImplementedError(f"Operator {op} not implemented")
-
     def call_function(self, name: str, args: List[Expression], kwargs: List = None) -> Any:
         # print(f"[DEBUG] call_function called with name='{name}'")
 
@@ -1043,147 +1356,191 @@ class Interpreter:
                         for kw in kwargs:
                             evaluated_kwargs[kw.name] = self.eval_expression(kw.value)
                     return obj(*evaluated_args, **evaluated_kwargs)
-                elif isinstance(obj, FuncDeclaration):
+                elif type(obj) is FuncDeclaration:
                     # It's a When function in the same module
                     qualified_name = f"{self.current_module}.{name}"
                     if qualified_name not in self.functions:
                         self.functions[qualified_name] = obj
                         self.function_modules[qualified_name] = self.current_module
                     return self.call_function(qualified_name, args, kwargs)
-                elif isinstance(obj, Block):
+                elif type(obj) is Block:
                     # It's a block in the same module - execute it directly
-                    self.execute_statements(obj.body)
+                    self._escape_flow(run_code(self, obj.get_code()))
                     return None
 
-        # Built-in functions
-        if name == 'print':
-            values = [self.eval_expression(arg) for arg in args]
-            print(*values)
-            return None
-        elif name == 'sleep':
-            if args:
-                time.sleep(self.eval_expression(args[0]))
-            return None
-        elif name == 'input':
-            prompt = self.eval_expression(args[0]) if args else ""
-            return input(prompt)
-        elif name == 'int':
-            return int(self.eval_expression(args[0]))
-        elif name == 'str':
-            return str(self.eval_expression(args[0]))
-        elif name == 'len':
-            return len(self.eval_expression(args[0]))
-        elif name == 'abs':
-            return abs(self.eval_expression(args[0]))
-        elif name == 'rjust':
-            if len(args) >= 2:
-                string = str(self.eval_expression(args[0]))
-                width = self.eval_expression(args[1])
-                return string.rjust(width)
-            return str(self.eval_expression(args[0]))
-        elif name == 'globals':
-            # Return reference to global namespace for direct manipulation
-            return self.global_vars
-        elif name == 'setattr':
-            # Allow setting global variables from functions
-            if len(args) >= 3:
-                obj = self.eval_expression(args[0])
-                attr = self.eval_expression(args[1])
-                value = self.eval_expression(args[2])
-                setattr(obj, attr, value)
-            return None
-        elif name == 'exit':
-            self.exit_requested = True
-            raise ExitException()
+        if name in BUILTIN_CALLS:
+            return self._call_builtin(name, args)
+        return self._call_named(name, args, kwargs)
 
-        # Graphics functions
-        elif name == 'window':
-            if len(args) == 0:
-                graphics.window()
-            elif len(args) == 2:
-                width = self.eval_expression(args[0])
-                height = self.eval_expression(args[1])
-                graphics.window(width, height)
-            elif len(args) == 3:
-                width = self.eval_expression(args[0])
-                height = self.eval_expression(args[1])
-                title = self.eval_expression(args[2])
-                graphics.window(width, height, title)
-            return None
-        elif name == 'close_window':
-            graphics.close()
-            return None
-        elif name == 'is_window_open':
-            return graphics.is_open()
-        elif name == 'clear':
-            if args:
-                color = self.eval_expression(args[0])
-                graphics.clear(color)
-            else:
-                graphics.clear()
+    def _call_builtin(self, name: str, args: List[Expression]) -> Any:
+        """Call one of the built-in functions listed in BUILTIN_CALLS"""
+        return BUILTIN_HANDLERS[name](self, args)
+
+    # One-argument builtins call the argument's handler directly rather
+    # than going through eval_expression or building an argument list
+
+    def _builtin_print(self, args: List[Expression]) -> Any:
+        if len(args) == 1:
+            arg = args[0]
+            print(arg._eval(self, arg))
             return None
-        elif name == 'fill':
+        values = [self.eval_expression(arg) for arg in args]
+        print(*values)
+        return None
+
+    def _builtin_sleep(self, args: List[Expression]) -> Any:
+        if args:
+            time.sleep(self.eval_expression(args[0]))
+        return None
+
+    def _builtin_input(self, args: List[Expression]) -> Any:
+        prompt = self.eval_expression(args[0]) if args else ""
+        return input(prompt)
+
+    def _builtin_int(self, args: List[Expression]) -> Any:
+        arg = args[0]
+        return int(arg._eval(self, arg))
+
+    def _builtin_str(self, args: List[Expression]) -> Any:
+        arg = args[0]
+        return str(arg._eval(self, arg))
+
+    def _builtin_len(self, args: List[Expression]) -> Any:
+        arg = args[0]
+        return len(arg._eval(self, arg))
+
+    def _builtin_abs(self, args: List[Expression]) -> Any:
+        arg = args[0]
+        return abs(arg._eval(self, arg))
+
+    def _builtin_rjust(self, args: List[Expression]) -> Any:
+        if len(args) >= 2:
+            string = str(self.eval_expression(args[0]))
+            width = self.eval_expression(args[1])
+            return string.rjust(width)
+        return str(self.eval_expression(args[0]))
+
+    def _builtin_globals(self, args: List[Expression]) -> Any:
+        # Return reference to global namespace for direct manipulation
+        return self.global_vars
+
+    def _builtin_setattr(self, args: List[Expression]) -> Any:
+        # Allow setting global variables from functions
+        if len(args) >= 3:
+            obj = self.eval_expression(args[0])
+            attr = self.eval_expression(args[1])
+            value = self.eval_expression(args[2])
+            setattr(obj, attr, value)
+        return None
+
+    def _builtin_exit(self, args: List[Expression]) -> Any:
+        self.exit_requested = True
+        raise ExitException()
+
+    # Graphics functions
+    def _builtin_window(self, args: List[Expression]) -> Any:
+        if len(args) == 0:
+            graphics.window()
+        elif len(args) == 2:
+            width = self.eval_expression(args[0])
+            height = self.eval_expression(args[1])
+            graphics.window(width, height)
+        elif len(args) == 3:
+            width = self.eval_expression(args[0])
+            height = self.eval_expression(args[1])
+            title = self.eval_expression(args[2])
+            graphics.window(width, height, title)
+        return None
+
+    def _builtin_close_window(self, args: List[Expression]) -> Any:
+        graphics.close()
+        return None
+
+    def _builtin_is_window_open(self, args: List[Expression]) -> Any:
+        return graphics.is_open()
+
+    def _builtin_clear(self, args: List[Expression]) -> Any:
+        if args:
             color = self.eval_expression(args[0])
-            graphics.fill(color)
-            return None
-        elif name == 'rect':
-            if len(args) >= 4:
-                x = self.eval_expression(args[0])
-                y = self.eval_expression(args[1])
-                width = self.eval_expression(args[2])
-                height = self.eval_expression(args[3])
-                color = self.eval_expression(args[4]) if len(args) > 4 else "black"
-                graphics.rect(x, y, width, height, color)
-            return None
-        elif name == 'circle':
-            if len(args) >= 3:
-                x = self.eval_expression(args[0])
-                y = self.eval_expression(args[1])
-                radius = self.eval_expression(args[2])
-                color = self.eval_expression(args[3]) if len(args) > 3 else "black"
-                graphics.circle(x, y, radius, color)
-            return None
-        elif name == 'line':
-            if len(args) >= 4:
-                x1 = self.eval_expression(args[0])
-                y1 = self.eval_expression(args[1])
-                x2 = self.eval_expression(args[2])
-                y2 = self.eval_expression(args[3])
-                color = self.eval_expression(args[4]) if len(args) > 4 else "black"
-                width = self.eval_expression(args[5]) if len(args) > 5 else 1
-                graphics.line(x1, y1, x2, y2, color, width)
-            return None
-        elif name == 'text':
-            if len(args) >= 3:
-                x = self.eval_expression(args[0])
-                y = self.eval_expression(args[1])
-                message = self.eval_expression(args[2])
-                color = self.eval_expression(args[3]) if len(args) > 3 else "black"
-                size = self.eval_expression(args[4]) if len(args) > 4 else 12
-                graphics.text(x, y, message, color, size)
-            return None
-        elif name == 'update':
-            graphics.update()
-            return None
-        elif name == 'color':
-            if args:
-                color_name = self.eval_expression(args[0])
-                return graphics.get_color(color_name)
-            return None
-        elif name == 'is_key_pressed':
-            if args:
-                key = self.eval_expression(args[0])
-                return graphics.is_key_pressed(key)
-            return False
-        elif name == 'get_last_key':
-            return graphics.get_last_key()
-        elif name == 'clear_last_key':
-            graphics.clear_last_key()
-            return None
+            graphics.clear(color)
+        else:
+            graphics.clear()
+        return None
+
+    def _builtin_fill(self, args: List[Expression]) -> Any:
+        color = self.eval_expression(args[0])
+        graphics.fill(color)
+        return None
+
+    def _builtin_rect(self, args: List[Expression]) -> Any:
+        if len(args) >= 4:
+            x = self.eval_expression(args[0])
+            y = self.eval_expression(args[1])
+            width = self.eval_expression(args[2])
+            height = self.eval_expression(args[3])
+            color = self.eval_expression(args[4]) if len(args) > 4 else "black"
+            graphics.rect(x, y, width, height, color)
+        return None
+
+    def _builtin_circle(self, args: List[Expression]) -> Any:
+        if len(args) >= 3:
+            x = self.eval_expression(args[0])
+            y = self.eval_expression(args[1])
+            radius = self.eval_expression(args[2])
+            color = self.eval_expression(args[3]) if len(args) > 3 else "black"
+            graphics.circle(x, y, radius, color)
+        return None
+
+    def _builtin_line(self, args: List[Expression]) -> Any:
+        if len(args) >= 4:
+            x1 = self.eval_expression(args[0])
+            y1 = self.eval_expression(args[1])
+            x2 = self.eval_expression(args[2])
+            y2 = self.eval_expression(args[3])
+            color = self.eval_expression(args[4]) if len(args) > 4 else "black"
+            width = self.eval_expression(args[5]) if len(args) > 5 else 1
+            graphics.line(x1, y1, x2, y2, color, width)
+        return None
+
+    def _builtin_text(self, args: List[Expression]) -> Any:
+        if len(args) >= 3:
+            x = self.eval_expression(args[0])
+            y = self.eval_expression(args[1])
+            message = self.eval_expression(args[2])
+            color = self.eval_expression(args[3]) if len(args) > 3 else "black"
+            size = self.eval_expression(args[4]) if len(args) > 4 else 12
+            graphics.text(x, y, message, color, size)
+        return None
+
+    def _builtin_update(self, args: List[Expression]) -> Any:
+        graphics.update()
+        return None
+
+    def _builtin_color(self, args: List[Expression]) -> Any:
+        if args:
+            color_name = self.eval_expression(args[0])
+            return graphics.get_color(color_name)
+        return None
+
+    def _builtin_is_key_pressed(self, args: List[Expression]) -> Any:
+        if args:
+            key = self.eval_expression(args[0])
+            return graphics.is_key_pressed(key)
+        return False
+
+    def _builtin_get_last_key(self, args: List[Expression]) -> Any:
+        return graphics.get_last_key()
+
+    def _builtin_clear_last_key(self, args: List[Expression]) -> Any:
+        graphics.clear_last_key()
+        return None
+
+    def _call_named(self, name: str, args: List[Expression], kwargs: List = None) -> Any:
+        """Call a block, Python callable or user function by name"""
         # Check if it's a block to execute (OS blocks can be called as functions)
-        elif name in self.blocks:
+        if name in self.blocks:
             block = self.blocks[name]
-            self.execute_statements(block.body)
+            self._escape_flow(run_code(self, block.get_code()))
             return None
         # Check if it's a Python object/class being called
         elif name in self.global_vars:
@@ -1200,99 +1557,80 @@ class Interpreter:
                         evaluated_kwargs[kw.name] = self.eval_expression(kw.value)
 
                 return obj(*evaluated_args, **evaluated_kwargs)
-        # Check if it's returning early somewhere
-        elif False:
-            pass
         # User-defined functions
         elif name in self.functions:
             func = self.functions[name]
             # print(f"[DEBUG] Found function '{name}' in self.functions")
 
-            # Count required and optional parameters
-            required_params = [p for p in func.params if p.default is None]
-            optional_params = [p for p in func.params if p.default is not None]
-
-            if len(args) < len(required_params):
-                raise ValueError(f"Function {name} expects at least {len(required_params)} arguments, got {len(args)}")
-            if len(args) > len(func.params):
-                raise ValueError(f"Function {name} expects at most {len(func.params)} arguments, got {len(args)}")
-
-            # Create function execution context that can modify globals
-            saved_params = {}
-
-            # Save parameter values if they exist in globals or module namespace
-            saved_module_params = {}
-            for param in func.params:
-                param_name = param.name if hasattr(param, 'name') else param
-                if param_name in self.global_vars:
-                    saved_params[param_name] = self.global_vars[param_name]
-                # Also save module namespace parameters if this is a module function
-                if name in self.function_modules:
-                    module = self.function_modules[name]
-                    if module in self.module_namespaces and param_name in self.module_namespaces[module]:
-                        saved_module_params[param_name] = self.module_namespaces[module][param_name]
+            # Parameter names and required count, computed once per declaration
+            param_names, required = self._signature(func)
+
+            if len(args) < required:
+                raise ValueError(f"Function {name} expects at least {required} arguments, got {len(args)}")
+            if len(args) > len(param_names):
+                raise ValueError(f"Function {name} expects at most {len(param_names)} arguments, got {len(args)}")
+
+            # Parameters shadow globals (and the module namespace for module
+            # functions) for the duration of the call. Only the previous values
+            # of the parameter names are saved, so a call costs O(params) no
+            # matter how many globals exist, and other global changes persist.
+            global_vars = self.global_vars
+            module = self.function_modules.get(name)
+            module_ns = self.module_namespaces.get(module) if module is not None else None
+
+            # Evaluate every argument in the caller's scope before any
+            # parameter is bound, so f(b, a) with params (a, b) swaps them
+            arg_values = [self.eval_expression(arg) for arg in args]
+
+            saved_params = [global_vars.get(param_name, _MISSING) for param_name in param_names]
+            saved_module_params = None
+            if module_ns is not None:
+                saved_module_params = [module_ns.get(param_name, _MISSING) for param_name in param_names]
 
             # Bind parameters with provided arguments
-            for i, arg in enumerate(args):
-                param = func.params[i]
-                param_name = param.name if hasattr(param, 'name') else param
-                arg_value = self.eval_expression(arg)
-                # DEBUG
-                # if name == "whGame.is_key_pressed":
-                #     print(f"[DEBUG] Binding param '{param_name}' = {arg_value} (from arg {arg})")
-                self.global_vars[param_name] = arg_value
+            for param_name, arg_value in zip(param_names, arg_values):
+                global_vars[param_name] = arg_value
 
                 # If this is a module function, also set the parameter in the module namespace
-                if name in self.function_modules:
-                    module = self.function_modules[name]
-                    if module in self.module_namespaces:
-                        self.module_namespaces[module][param_name] = arg_value
+                if module_ns is not None:
+                    module_ns[param_name] = arg_value
 
             # Bind remaining parameters with default values
             for i in range(len(args), len(func.params)):
                 param = func.params[i]
-                param_name = param.name if hasattr(param, 'name') else param
                 if hasattr(param, 'default') and param.default is not None:
-                    self.global_vars[param_name] = self.eval_expression(param.default)
+                    global_vars[param_names[i]] = self.eval_expression(param.default)
                 else:
-                    raise ValueError(f"No value provided for required parameter {param_name}")
+                    raise ValueError(f"No value provided for required parameter {param_names[i]}")
 
             # Set module context if this function belongs to a module
             saved_module = self.current_module
-            if name in self.function_modules:
-                self.current_module = self.function_modules[name]
-                # print(f"[DEBUG] Executing function '{name}' in module '{self.current_module}'")
+            if module is not None:
+                self.current_module = module
 
             # Execute function body with access to modify globals
             try:
-                # print(f"[DEBUG] Executing {len(func.body)} statements in function '{name}'")
-                self.execute_statements(func.body)
-                result = None
+                result = self._function_result(self.execute_body(func))
             except ReturnException as ret:
                 result = ret.value
             finally:
                 # Restore module context
                 self.current_module = saved_module
                 # Only restore original parameter values, keep all other global changes
-                for param in func.params:
-                    param_name = param.name if hasattr(param, 'name') else param
-                    if param_name in saved_params:
-                        self.global_vars[param_name] = saved_params[param_name]
-                    else:
+                for param_name, saved in zip(param_names, saved_params):
+                    if saved is _MISSING:
                         # Remove parameter if it wasn't originally a global
-                        if param_name in self.global_vars:
-                            del self.global_vars[param_name]
-
-                    # Also restore module namespace parameters
-                    if name in self.function_modules:
-                        module = self.function_modules[name]
-                        if module in self.module_namespaces:
-                            if param_name in saved_module_params:
-                                self.module_namespaces[module][param_name] = saved_module_params[param_name]
-                            else:
-                                # Remove parameter if it wasn't originally in module namespace
-                                if param_name in self.module_namespaces[module]:
-                                    del self.module_namespaces[module][param_name]
+                        global_vars.pop(param_name, None)
+                    else:
+                        global_vars[param_name] = saved
+
+                # Also restore module namespace parameters
+                if module_ns is not None:
+                    for param_name, saved in zip(param_names, saved_module_params):
+                        if saved is _MISSING:
+                            module_ns.pop(param_name, None)
+                        else:
+                            module_ns[param_name] = saved
 
             return result
         else:
@@ -1300,6 +1638,16 @@ class Interpreter:
             # print(f"[DEBUG] Available functions: {list(self.functions.keys())[:10]}")
             raise NameError(f"Function '{name}' not defined")
 
+    @staticmethod
+    def _signature(func: FuncDeclaration) -> tuple:
+        """Return (parameter names, required count), cached on the declaration"""
+        signature = func._signature
+        if signature is None:
+            param_names = tuple(param.name if hasattr(param, 'name') else param for param in func.params)
+            required = sum(1 for param in func.params if param.default is None)
+            signature = func._signature = (param_names, required)
+        return signature
+
     def start_block(self, block_name: str):
         if block_name not in self.blocks:
             raise NameError(f"Block '{block_name}' not defined")
@@ -1308,7 +1656,7 @@ class Interpreter:
 
         # OS blocks execute immediately once and don't get added to running blocks
         if block.block_type == "os":
-            self.execute_statements(block.body)
+            self._escape_flow(run_code(self, block.get_code()))
             return
 
         # Reset and start the block
@@ -1320,24 +1668,60 @@ class Interpreter:
                 # Don't resolve yet - let it be resolved each time it's needed
                 pass
         
-        block.status = BlockStatus.RUNNING
+        block.status = BLOCK_RUNNING
 
         # Handle parallel vs cooperative execution
         if block.is_parallel:
-            # Start in its own thread
-            block.thread = threading.Thread(
-                target=self.run_parallel_block,
-                args=(block,),
-                name=f"when-{block_name}",
-                daemon=False  # Don't make daemon so we can properly wait for them
-            )
-            block.thread.start()
-            self.parallel_threads.append(block.thread)
-            # print(f"[PARALLEL] Started {block_name} in thread {block.thread.name}")
+            # Run on a pooled thread
+            self._submit_parallel(block)
         else:
             # Add to cooperative scheduling
-            if block_name not in self.running_blocks:
-                self.running_blocks.append(block_name)
+            self.schedule_block(block_name)
+
+    def _submit_parallel(self, block: Block):
+        """Run a parallel block on the thread pool, or its own thread if the pool is full"""
+        with self.global_vars_lock:
+            if self._thread_pool is None:
+                self._thread_pool = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=PARALLEL_WORKERS, thread_name_prefix="when")
+            pool = self._thread_pool
+        # Drop finished runs so repeated starts do not grow the list
+        self.parallel_futures = [future for future in self.parallel_futures if not future.done()]
+        if len(self.parallel_futures) < PARALLEL_WORKERS:
+            block.future = pool.submit(self.run_parallel_block, block)
+        else:
+            # Every pooled thread is held by a running block, so a queued
+            # block would not start until one of them finishes
+            block.future = concurrent.futures.Future()
+            threading.Thread(
+                target=self._run_parallel_thread, args=(block, block.future),
+                name=f"when-{block.name}", daemon=False
+            ).start()
+        self.parallel_futures.append(block.future)
+
+    def _run_parallel_thread(self, block: Block, future: concurrent.futures.Future):
+        """Run a parallel block on a dedicated thread, completing future when done"""
+        if future.set_running_or_notify_cancel():
+            try:
+                self.run_parallel_block(block)
+            finally:
+                future.set_result(None)
+
+    def schedule_block(self, block_name: str):
+        """Add a block to cooperative scheduling, or swap in its current object.
+
+        A no-op when the block is already scheduled with the same object.
+        """
+        block = self.blocks.get(block_name)
+        if block is not None and self.running_blocks.get(block_name) is not block:
+            self.running_blocks[block_name] = block
+            self._running_snapshot = None
+
+    def unschedule_block(self, block_name: str):
+        """Remove a block from cooperative scheduling (no-op if not scheduled)"""
+        if block_name in self.running_blocks:
+            del self.running_blocks[block_name]
+            self._running_snapshot = None
 
     def stop_block(self, block_name: str):
         if block_name not in self.blocks:
@@ -1348,17 +1732,15 @@ class Interpreter:
         if block.is_parallel:
             # Stop parallel thread
             block.should_stop.set()
-            block.status = BlockStatus.STOPPED
-            if block.thread and block.thread.is_alive():
-                # print(f"[PARALLEL] Stopping {block_name} thread...")
-                block.thread.join(timeout=2.0)
-                if block.thread.is_alive():
-                    pass  # Thread did not stop gracefully
+            block.status = BLOCK_STOPPED
+            if block.future is not None and not block.future.done():
+                # Give the thread a moment to finish its current iteration
+                concurrent.futures.wait((block.future,), timeout=2.0)
         else:
             # Stop cooperative block
             if block_name in self.running_blocks:
-                block.status = BlockStatus.STOPPED
-                self.running_blocks.remove(block_name)
+                block.status = BLOCK_STOPPED
+                self.unschedule_block(block_name)
 
     def save_block(self, block_name: str):
         """Save the current state of a block"""
@@ -1386,7 +1768,7 @@ class Interpreter:
         # OS blocks can't use saved state - they always execute immediately once
         if block.block_type == "os":
             print(f"[STARTSAVE] OS block '{block_name}' executed (OS blocks don't support saved state)")
-            self.execute_statements(block.body)
+            self._escape_flow(run_code(self, block.get_code()))
             return
 
         # Try to restore saved state
@@ -1397,21 +1779,15 @@ class Interpreter:
             block.reset()
 
         # Start the block
-        block.status = BlockStatus.RUNNING
+        block.status = BLOCK_RUNNING
 
         # Handle parallel vs cooperative execution
         if block.is_parallel:
-            # Start in its own thread
-            block.thread = threading.Thread(
-                target=self.run_parallel_block,
-                args=(block,),
-                daemon=True
-            )
-            block.thread.start()
+            # Run on a pooled thread
+            self._submit_parallel(block)
         else:
             # Add to cooperative execution list
-            if block_name not in self.running_blocks:
-                self.running_blocks.append(block_name)
+            self.schedule_block(block_name)
 
     def discard_block(self, block_name: str):
         """Discard saved state for a block"""
@@ -1431,35 +1807,34 @@ class Interpreter:
             # Import When package
             self.import_when_package(decl.module, decl.alias)
         else:
+            # Unchanged Python imports (e.g. on hot reload) just rebind
+            key = ('import', decl.module, decl.alias)
+            if self._rebind_cached_import(key, decl.module):
+                return
+
             # Try as Python module
+            bindings = []
             try:
                 # For dotted imports like urllib.request, we need to handle differently
                 if '.' in decl.module:
-                    parts = decl.module.split('.')
-                    # Import the top-level module
-                    top_module = __import__(decl.module)
+                    module = _import_module(decl.module)
 
                     # Store the top-level module so we can access it
-                    self.global_vars[parts[0]] = top_module
-                    self.modules[parts[0]] = top_module
-
-                    # Navigate to the actual submodule
-                    module = top_module
-                    for part in parts[1:]:
-                        module = getattr(module, part)
+                    top_name = decl.module.split('.', 1)[0]
+                    bindings.append((top_name, sys.modules[top_name], True))
 
                     # If there's an alias, use it for the full module
                     if decl.alias:
-                        self.global_vars[decl.alias] = module
-                        self.modules[decl.alias] = module
+                        bindings.append((decl.alias, module, True))
                 else:
-                    module = __import__(decl.module)
+                    module = _import_module(decl.module)
                     name = decl.alias if decl.alias else decl.module
-                    self.global_vars[name] = module
-                    self.modules[name] = module
+                    bindings.append((name, module, True))
             except ImportError as e:
                 raise ImportError(f"Cannot import module '{decl.module}': {e}")
 
+            self._bind_import(key, decl.module, bindings)
+
     def handle_from_import(self, decl: FromImportDeclaration):
         # Check if it's a When file import
         when_file = decl.module + '.when'
@@ -1467,19 +1842,49 @@ class Interpreter:
             # Import specific items from When package
             self.import_from_when_package(decl.module, decl.names, decl.aliases)
         else:
+            # Unchanged Python imports (e.g. on hot reload) just rebind
+            key = ('from', decl.module, tuple(decl.names), tuple(decl.aliases))
+            if self._rebind_cached_import(key, decl.module):
+                return
+
             # Try as Python module
+            bindings = []
             try:
-                module = __import__(decl.module, fromlist=decl.names)
+                module = _import_module(decl.module, decl.names)
                 for name, alias in zip(decl.names, decl.aliases):
                     if hasattr(module, name):
                         attr = getattr(module, name)
                         var_name = alias if alias else name
-                        self.global_vars[var_name] = attr
+                        bindings.append((var_name, attr, False))
                     else:
                         raise ImportError(f"Cannot import '{name}' from '{decl.module}'")
             except ImportError as e:
                 raise ImportError(f"Cannot import from module '{decl.module}': {e}")
 
+            self._bind_import(key, decl.module, bindings)
+
+    def _bind_import(self, key: tuple, module_name: str, bindings: List[tuple]):
+        """Apply (name, value, is_module) import bindings and remember them"""
+        self._apply_import_bindings(bindings)
+        self._import_cache[key] = (sys.modules.get(module_name), bindings)
+
+    def _apply_import_bindings(self, bindings: List[tuple]):
+        for name, value, is_module in bindings:
+            self.global_vars[name] = value
+            if is_module:
+                self.modules[name] = value
+
+    def _rebind_cached_import(self, key: tuple, module_name: str) -> bool:
+        """Re-apply a previous import's bindings if its module is unchanged"""
+        cached = self._import_cache.get(key)
+        if cached is None:
+            return False
+        module, bindings = cached
+        if module is None or sys.modules.get(module_name) is not module:
+            return False
+        self._apply_import_bindings(bindings)
+        return True
+
     def import_when_package(self, module_name: str, alias: Optional[str] = None):
         """Import a When package, exposing its functions and blocks but not executing main"""
         when_file = module_name + '.when'
@@ -1507,34 +1912,30 @@ class Interpreter:
 
         # Process imports first - add them to module namespace
         for decl in program.declarations:
-            if isinstance(decl, ImportDeclaration):
+            if type(decl) is ImportDeclaration:
                 # Import the Python module and add to namespace
                 try:
                     # For dotted imports like urllib.request
                     if '.' in decl.module:
-                        parts = decl.module.split('.')
-                        # Import and store the top-level module
-                        top_module = __import__(decl.module)
-                        module_namespace[parts[0]] = top_module
+                        imported_module = _import_module(decl.module)
 
-                        # Navigate to the actual submodule
-                        imported_module = top_module
-                        for part in parts[1:]:
-                            imported_module = getattr(imported_module, part)
+                        # Store the top-level module
+                        top_name = decl.module.split('.', 1)[0]
+                        module_namespace[top_name] = sys.modules[top_name]
 
                         # If there's an alias, use it
                         if decl.alias:
                             module_namespace[decl.alias] = imported_module
                     else:
-                        imported_module = __import__(decl.module)
+                        imported_module = _import_module(decl.module)
                         name_in_namespace = decl.alias if decl.alias else decl.module
                         module_namespace[name_in_namespace] = imported_module
                 except ImportError as e:
                     raise ImportError(f"Cannot import module '{decl.module}': {e}")
-            elif isinstance(decl, FromImportDeclaration):
+            elif type(decl) is FromImportDeclaration:
                 # Import specific items from Python module
                 try:
-                    imported_module = __import__(decl.module, fromlist=decl.names)
+                    imported_module = _import_module(decl.module, decl.names)
                     for import_name, alias in zip(decl.names, decl.aliases):
                         if hasattr(imported_module, import_name):
                             attr = getattr(imported_module, import_name)
@@ -1545,9 +1946,9 @@ class Interpreter:
 
         # Process other declarations (variables, functions, and classes)
         for decl in program.declarations:
-            if isinstance(decl, VarDeclaration):
+            if type(decl) is VarDeclaration:
                 module_namespace[decl.name] = self.eval_expression(decl.value)
-            elif isinstance(decl, FuncDeclaration):
+            elif type(decl) is FuncDeclaration:
                 # Register the function with its module context
                 qualified_func_name = f"{name}.{decl.name}"
                 self.functions[qualified_func_name] = decl
@@ -1557,7 +1958,7 @@ class Interpreter:
                 # self.function_modules[decl.name] = name
                 # Store the declaration for the module
                 module_namespace[decl.name] = decl
-            elif isinstance(decl, ClassDeclaration):
+            elif type(decl) is ClassDeclaration:
                 # Register the class
                 self.classes[decl.name] = decl
                 # Create a class constructor
@@ -1569,34 +1970,9 @@ class Interpreter:
         for block in program.blocks:
             block_name = block.name
             qualified_name = f"{name}.{block_name}"
-            if isinstance(block, OSBlock):
-                block_obj = Block(qualified_name, block.body, None, "os", False)
-                module_namespace[block_name] = block_obj
-                self.blocks[qualified_name] = block_obj
-            elif isinstance(block, ParallelDEBlock):
-                if isinstance(block.iterations, str):
-                    iterations = ('var', block.iterations)
-                else:
-                    iterations = block.iterations
-                block_obj = Block(qualified_name, block.body, iterations, "de", True)
-                module_namespace[block_name] = block_obj
-                self.blocks[qualified_name] = block_obj
-            elif isinstance(block, ParallelFOBlock):
-                block_obj = Block(qualified_name, block.body, None, "fo", True)
-                module_namespace[block_name] = block_obj
-                self.blocks[qualified_name] = block_obj
-            elif isinstance(block, DEBlock):
-                if isinstance(block.iterations, str):
-                    iterations = ('var', block.iterations)
-                else:
-                    iterations = block.iterations
-                block_obj = Block(qualified_name, block.body, iterations, "de", False)
-                module_namespace[block_name] = block_obj
-                self.blocks[qualified_name] = block_obj
-            else:  # Regular FOBlock
-                block_obj = Block(qualified_name, block.body, None, "fo", False)
-                module_namespace[block_name] = block_obj
-                self.blocks[qualified_name] = block_obj
+            block_obj = self.make_block(block, qualified_name)
+            module_namespace[block_name] = block_obj
+            self.blocks[qualified_name] = block_obj
 
         # Create a custom module class that uses the namespace dictionary
         class WhenModule:
@@ -1621,7 +1997,7 @@ class Interpreter:
         # Don't add FuncDeclarations to global namespace with module prefix
         # They should only be in self.functions
         for key, value in module_namespace.items():
-            if not isinstance(value, FuncDeclaration):
+            if type(value) is not FuncDeclaration:
                 self.global_vars[f"{name}.{key}"] = value
 
     def import_from_when_package(self, module_name: str, names: List[str], aliases: List[Optional[str]]):
@@ -1645,11 +2021,11 @@ class Interpreter:
 
         # Process declarations
         for decl in program.declarations:
-            if isinstance(decl, VarDeclaration):
+            if type(decl) is VarDeclaration:
                 temp_namespace[decl.name] = self.eval_expression(decl.value)
-            elif isinstance(decl, FuncDeclaration):
+            elif type(decl) is FuncDeclaration:
                 temp_namespace[decl.name] = decl
-            elif isinstance(decl, ClassDeclaration):
+            elif type(decl) is ClassDeclaration:
                 # Create a class constructor
                 def make_constructor(class_decl):
                     return lambda *args, **kwargs: self.instantiate_class(class_decl, args, kwargs)
@@ -1657,25 +2033,7 @@ class Interpreter:
 
         # Process blocks
         for block in program.blocks:
-            block_name = block.name
-            if isinstance(block, OSBlock):
-                temp_namespace[block_name] = Block(block_name, block.body, None, "os", False)
-            elif isinstance(block, ParallelDEBlock):
-                if isinstance(block.iterations, str):
-                    iterations = ('var', block.iterations)
-                else:
-                    iterations = block.iterations
-                temp_namespace[block_name] = Block(block_name, block.body, iterations, "de", True)
-            elif isinstance(block, ParallelFOBlock):
-                temp_namespace[block_name] = Block(block_name, block.body, None, "fo", True)
-            elif isinstance(block, DEBlock):
-                if isinstance(block.iterations, str):
-                    iterations = ('var', block.iterations)
-                else:
-                    iterations = block.iterations
-                temp_namespace[block_name] = Block(block_name, block.body, iterations, "de", False)
-            else:  # Regular FOBlock
-                temp_namespace[block_name] = Block(block_name, block.body, None, "fo", False)
+            temp_namespace[block.name] = self.make_block(block)
 
         # Import only requested items
         for name, alias in zip(names, aliases):
@@ -1684,9 +2042,9 @@ class Interpreter:
                 item = temp_namespace[name]
 
                 # If it's a function or block, register it appropriately
-                if isinstance(item, FuncDeclaration):
+                if type(item) is FuncDeclaration:
                     self.functions[var_name] = item
-                elif isinstance(item, Block):
+                elif type(item) is Block:
                     self.blocks[var_name] = item
 
                 self.global_vars[var_name] = item
@@ -1747,67 +2105,71 @@ class Interpreter:
 
     def call_method(self, instance, method: FuncDeclaration, args: List, kwargs: dict) -> Any:
         """Call a method on an instance"""
-        # Save parameter values
-        saved_params = {}
+        # Parameters shadow globals for the call, as in _call_named: only the
+        # previous values of the parameter names are saved and restored
+        global_vars = self.global_vars
+        params = method.params
+        param_names = self._signature(method)[0]
+        saved_params = [global_vars.get(param_name, _MISSING) for param_name in param_names]
 
         # The first parameter is 'self'
-        params = method.params
-        if len(params) > 0:
-            self_param = params[0]
-            self_param_name = self_param.name if hasattr(self_param, 'name') else self_param
-
-            # Save and bind parameters
-            for i, param in enumerate(params):
-                param_name = param.name if hasattr(param, 'name') else param
-                if param_name in self.global_vars:
-                    saved_params[param_name] = self.global_vars[param_name]
-
-                if i == 0:
-                    # Bind 'self'
-                    self.global_vars[param_name] = instance
-                elif i - 1 < len(args):
-                    # Bind provided arguments (offset by 1 since self is first)
-                    self.global_vars[param_name] = args[i - 1]
-                elif hasattr(param, 'default') and param.default is not None:
+        for i, param_name in enumerate(param_names):
+            if i == 0:
+                # Bind 'self'
+                global_vars[param_name] = instance
+            elif i - 1 < len(args):
+                # Bind provided arguments (offset by 1 since self is first)
+                global_vars[param_name] = args[i - 1]
+            else:
+                param = params[i]
+                if hasattr(param, 'default') and param.default is not None:
                     # Use default value
-                    self.global_vars[param_name] = self.eval_expression(param.default)
+                    global_vars[param_name] = self.eval_expression(param.default)
 
         try:
-            self.execute_statements(method.body)
-            result = None
+            result = self._function_result(self.execute_body(method))
         except ReturnException as ret:
             result = ret.value
         finally:
             # Restore parameters
-            for param in params:
-                param_name = param.name if hasattr(param, 'name') else param
-                if param_name in saved_params:
-                    self.global_vars[param_name] = saved_params[param_name]
-                elif param_name in self.global_vars:
-                    del self.global_vars[param_name]
+            for param_name, saved in zip(param_names, saved_params):
+                if saved is _MISSING:
+                    global_vars.pop(param_name, None)
+                else:
+                    global_vars[param_name] = saved
 
         return result
 
     def run_parallel_block(self, block: Block):
         """Run a block in its own thread"""
+        self._enter_parallel()
         try:
             # print(f"[PARALLEL] {block.name} thread started")
-
             if block.block_type == "de":
                 # Resolve iterations at runtime
                 iterations = self.resolve_block_iterations(block)
-                
+
+                if block.process_parallel and self._run_in_process(block, iterations):
+                    return
+
                 # Declarative block - run exactly N times
                 while (block.current_iteration < iterations and
                        not block.should_stop.is_set() and
                        not self.exit_requested):
 
                     try:
-                        self.execute_statements(block.body)
+                        flow = self.run_block_body(block)
+                        if flow == FLOW_BREAK:
+                            break
+                        if type(flow) is tuple:
+                            self._escape_flow(flow)
                         block.current_iteration += 1
+                        if flow == FLOW_CONTINUE:
+                            continue
 
-                        # Small delay to allow cooperative behavior
-                        time.sleep(0.01)
+                        # Delay between iterations; wakes as soon as the block is stopped
+                        if block.tick_interval:
+                            block.should_stop.wait(block.tick_interval)
 
                     except BreakException:
                         break
@@ -1824,10 +2186,17 @@ class Interpreter:
                        not self.exit_requested):
 
                     try:
-                        self.execute_statements(block.body)
-
-                        # Small delay to prevent tight loops
-                        time.sleep(0.01)
+                        flow = self.run_block_body(block)
+                        if flow == FLOW_BREAK:
+                            break
+                        if type(flow) is tuple:
+                            self._escape_flow(flow)
+                        if flow == FLOW_CONTINUE:
+                            continue
+
+                        # Delay between iterations; wakes as soon as the block is stopped
+                        if block.tick_interval:
+                            block.should_stop.wait(block.tick_interval)
 
                     except BreakException:
                         break
@@ -1839,24 +2208,165 @@ class Interpreter:
             import traceback
             traceback.print_exc()
         finally:
-            block.status = BlockStatus.COMPLETED
+            block.status = BLOCK_COMPLETED
+            self._exit_parallel()
             # print(f"[PARALLEL] {block.name} thread finished")
 
+    def _run_in_process(self, block: Block, iterations: int) -> bool:
+        """Run a DE block's remaining iterations in a worker process.
+
+        The worker gets PROCESS_CHUNK iterations at a time and runs them with
+        the block's numeric kernel against a snapshot of the variables it
+        reads. After each chunk the variables it assigns and the iteration
+        count are written back, stop and exit are checked, and the block's
+        tick is waited once. Returns False, so the block runs the rest in
+        its thread, when the body or its inputs are not numeric or a chunk
+        raises; the interpreted body then reports the error where it occurs.
+        """
+        kernel = block.kernel
+        pool = self._get_process_pool() if kernel is not None else None
+        while block.current_iteration < iterations:
+            values = None
+            if kernel is not None:
+                with self.global_vars_lock:
+                    values = [self.global_vars.get(name, _MISSING) for name in kernel.inputs]
+            if values is None or any(type(value) not in NUMERIC_TYPES for value in values):
+                print(f"[PARALLEL] {block.name}: process=True needs a numeric body; running in a thread")
+                return False
+
+            count = min(PROCESS_CHUNK, iterations - block.current_iteration)
+            future = pool.submit(
+                run_kernel_loop, kernel.source, kernel.inputs, kernel.outputs,
+                values, count, self.jit)
+            while True:
+                try:
+                    results = future.result(timeout=0.05)
+                    break
+                except concurrent.futures.TimeoutError:
+                    if block.should_stop.is_set() or self.exit_requested:
+                        # The chunk in flight is discarded
+                        future.cancel()
+                        return True
+                except Exception:
+                    return False
+
+            with self.global_vars_lock:
+                self.global_vars.update(results)
+            block.current_iteration += count
+            if block.should_stop.is_set() or self.exit_requested:
+                return True
+            if block.tick_interval and block.current_iteration < iterations:
+                block.should_stop.wait(block.tick_interval)
+        return True
+
+    def _get_process_pool(self):
+        """Return the worker pool for process=True blocks, creating it once"""
+        with self.global_vars_lock:
+            if self._process_pool is None:
+                # Spawned workers start clean instead of forking this
+                # process along with its running threads and held locks
+                self._process_pool = concurrent.futures.ProcessPoolExecutor(
+                    mp_context=multiprocessing.get_context("spawn"))
+            return self._process_pool
+
+    def _enter_parallel(self):
+        """Count a starting parallel thread; variables are shared from now on"""
+        with self.global_vars_lock:
+            self.parallel_count += 1
+            self._vars_shared = True
+
+    def _exit_parallel(self):
+        """Count a finished parallel thread; drop locking once none are left"""
+        with self.global_vars_lock:
+            self.parallel_count -= 1
+            self._vars_shared = self.parallel_count > 0 or not _GIL_ENABLED
+
     def cleanup_parallel_threads(self):
         """Clean up all parallel threads"""
         # print("[PARALLEL] Cleaning up threads...")
 
         # Signal all parallel blocks to stop
         for block in self.blocks.values():
-            if block.is_parallel and block.thread:
+            if block.is_parallel and block.future is not None:
                 block.should_stop.set()
 
-        # Wait for threads to finish
-        for thread in self.parallel_threads:
-            if thread.is_alive():
-                thread.join(timeout=3.0)
-                if thread.is_alive():
-                    pass  # Thread did not stop
-
-        self.parallel_threads.clear()
-        # print("[PARALLEL] Cleanup complete")
\ No newline at end of file
+        # Cancel runs that never got a thread, then wait for the rest
+        for future in self.parallel_futures:
+            future.cancel()
+        if self.parallel_futures:
+            concurrent.futures.wait(self.parallel_futures, timeout=3.0)
+        self.parallel_futures.clear()
+
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=False)
+            self._thread_pool = None
+
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False)
+            self._process_pool = None
+        # print("[PARALLEL] Cleanup complete")
+
+
+def _install_dispatch():
+    """Install statement/expression handlers on the AST node classes.
+
+    execute_statement and eval_expression then dispatch with a single
+    attribute lookup (node._exec / node._eval) instead of a type switch.
+    Runs once per process; later calls (e.g. new interpreters) are no-ops.
+    """
+    if ASTNode.__dict__.get('_dispatch_installed'):
+        return
+
+    ASTNode._exec = staticmethod(Interpreter._exec_unknown)
+    ASTNode._eval = staticmethod(Interpreter._eval_unknown)
+
+    # Built-in function name -> Interpreter._builtin_<name>
+    BUILTIN_HANDLERS.update(
+        (name, getattr(Interpreter, f'_builtin_{name}')) for name in BUILTIN_CALLS
+    )
+
+    for cls, handler in (
+        (ExpressionStatement, Interpreter._exec_expression_statement),
+        (TupleUnpackingAssignment, Interpreter._exec_tuple_unpacking_assignment),
+        (Assignment, Interpreter._exec_assignment),
+        (IndexAssignment, Interpreter._exec_index_assignment),
+        (AttributeAssignment, Interpreter._exec_attribute_assignment),
+        (WhenStatement, Interpreter._exec_when),
+        (WithStatement, Interpreter._exec_with),
+        (BreakStatement, Interpreter._exec_break),
+        (ContinueStatement, Interpreter._exec_continue),
+        (ExitStatement, Interpreter._exec_exit),
+        (PassStatement, Interpreter._exec_pass),
+        (ReturnStatement, Interpreter._exec_return),
+        (GlobalStatement, Interpreter._exec_global),
+    ):
+        cls._exec = staticmethod(handler)
+
+    for cls, handler in (
+        (NumberLiteral, Interpreter._eval_number_literal),
+        (StringLiteral, Interpreter._eval_string_literal),
+        (FStringLiteral, Interpreter._eval_fstring_literal),
+        (BooleanLiteral, Interpreter._eval_boolean_literal),
+        (NoneLiteral, Interpreter._eval_none_literal),
+        (ListLiteral, Interpreter._eval_list_literal),
+        (TupleLiteral, Interpreter._eval_tuple_literal),
+        (DictLiteral, Interpreter._eval_dict_literal),
+        (SliceExpression, Interpreter._eval_slice),
+        (IndexExpression, Interpreter._eval_index),
+        (UnaryOp, Interpreter._eval_unary_op),
+        (TernaryOp, Interpreter._eval_ternary_op),
+        (Identifier, Interpreter._eval_identifier),
+        (BinaryOp, Interpreter._eval_binary_op),
+        (CallExpression, Interpreter._eval_call),
+        (StartExpression, Interpreter._eval_start),
+        (StopExpression, Interpreter._eval_stop),
+        (SaveExpression, Interpreter._eval_save),
+        (SaveStopExpression, Interpreter._eval_save_stop),
+        (StartSaveExpression, Interpreter._eval_start_save),
+        (DiscardExpression, Interpreter._eval_discard),
+        (MemberAccess, Interpreter._eval_member_access),
+        (MethodCall, Interpreter._eval_method_call),
+    ):
+        cls._eval = staticmethod(handler)
+
+    ASTNode._dispatch_installed = True
\ No newline at end of file
@@ -1,9 +1,18 @@
 import re
-from enum import Enum, auto
+import sys
+from enum import Enum, IntEnum, auto
 from dataclasses import dataclass
 from typing import List, Optional
 
-class TokenType(Enum):
+class TokenType(IntEnum):
+    # IntEnum so comparing and hashing token types (the parser does both
+    # for every token) run as C int operations, while str() and f-strings
+    # still name the member (TokenType.ELSE) in error messages
+    __str__ = Enum.__str__
+
+    def __format__(self, format_spec):
+        return str(self).__format__(format_spec)
+
     # Keywords
     MAIN = auto()
     OS = auto()
@@ -85,11 +94,78 @@ class TokenType(Enum):
 
 @dataclass
 class Token:
+    __slots__ = ('type', 'value', 'line', 'column')
     type: TokenType
     value: any
     line: int
     column: int
 
+# Keywords by spelling ('os' is not here: it is context-sensitive, see
+# Lexer.read_identifier)
+KEYWORDS = {
+    'main': TokenType.MAIN,
+    'de': TokenType.DE,
+    'fo': TokenType.FO,
+    'parallel': TokenType.PARALLEL,
+    'when': TokenType.WHEN,
+    'def': TokenType.DEF,
+    'class': TokenType.CLASS,
+    'import': TokenType.IMPORT,
+    'from': TokenType.FROM,
+    'as': TokenType.AS,
+    'else': TokenType.ELSE,
+    'break': TokenType.BREAK,
+    'continue': TokenType.CONTINUE,
+    'pass': TokenType.PASS,
+    'return': TokenType.RETURN,
+    'global': TokenType.GLOBAL,
+    'start': TokenType.START,
+    'stop': TokenType.STOP,
+    'save': TokenType.SAVE,
+    'savestop': TokenType.SAVESTOP,
+    'startsave': TokenType.STARTSAVE,
+    'discard': TokenType.DISCARD,
+    'True': TokenType.TRUE,
+    'False': TokenType.FALSE,
+    'None': TokenType.NONE,
+    'and': TokenType.AND,
+    'or': TokenType.OR,
+    'not': TokenType.NOT,
+    'in': TokenType.IN,
+    'with': TokenType.WITH,
+    'is': TokenType.IS,
+}
+
+# Operators spelled with two characters
+TWO_CHAR_TOKENS = {
+    '==': TokenType.EQ,
+    '!=': TokenType.NE,
+    '<=': TokenType.LE,
+    '>=': TokenType.GE,
+    '//': TokenType.FLOORDIV,
+}
+
+# Single-character tokens
+SINGLE_CHAR_TOKENS = {
+    ':': TokenType.COLON,
+    '(': TokenType.LPAREN,
+    ')': TokenType.RPAREN,
+    '[': TokenType.LBRACKET,
+    ']': TokenType.RBRACKET,
+    '{': TokenType.LBRACE,
+    '}': TokenType.RBRACE,
+    ',': TokenType.COMMA,
+    '=': TokenType.ASSIGN,
+    '+': TokenType.PLUS,
+    '-': TokenType.MINUS,
+    '*': TokenType.MULTIPLY,
+    '/': TokenType.DIVIDE,
+    '%': TokenType.MODULO,
+    '<': TokenType.LT,
+    '>': TokenType.GT,
+    '.': TokenType.DOT,
+}
+
 class Lexer:
     def __init__(self, source: str):
         self.source = source
@@ -436,41 +512,8 @@ class Lexer:
         ident = ''
         while self.peek() and (self.peek().isalnum() or self.peek() == '_'):
             ident += self.advance()
-
-        # Check for keywords (removed 'os' from keywords - it's now context-sensitive)
-        keywords = {
-            'main': TokenType.MAIN,
-            'de': TokenType.DE,
-            'fo': TokenType.FO,
-            'parallel': TokenType.PARALLEL,
-            'when': TokenType.WHEN,
-            'def': TokenType.DEF,
-            'class': TokenType.CLASS,
-            'import': TokenType.IMPORT,
-            'from': TokenType.FROM,
-            'as': TokenType.AS,
-            'else': TokenType.ELSE,
-            'break': TokenType.BREAK,
-            'continue': TokenType.CONTINUE,
-            'pass': TokenType.PASS,
-            'return': TokenType.RETURN,
-            'global': TokenType.GLOBAL,
-            'start': TokenType.START,
-            'stop': TokenType.STOP,
-            'save': TokenType.SAVE,
-            'savestop': TokenType.SAVESTOP,
-            'startsave': TokenType.STARTSAVE,
-            'discard': TokenType.DISCARD,
-            'True': TokenType.TRUE,
-            'False': TokenType.FALSE,
-            'None': TokenType.NONE,
-            'and': TokenType.AND,
-            'or': TokenType.OR,
-            'not': TokenType.NOT,
-            'in': TokenType.IN,
-            'with': TokenType.WITH,
-            'is': TokenType.IS,
-        }
+        # Interned so name lookups in the interpreter compare by identity
+        ident = sys.intern(ident)
 
         # Handle 'os' context-sensitively
         if ident == 'os':
@@ -546,7 +589,7 @@ class Lexer:
             # Not a block declaration, treat as identifier
             return Token(TokenType.IDENTIFIER, ident, self.line, start_col)
 
-        token_type = keywords.get(ident, TokenType.IDENTIFIER)
+        token_type = KEYWORDS.get(ident, TokenType.IDENTIFIER)
         return Token(token_type, ident, self.line, start_col)
 
     def handle_indentation(self):
@@ -671,44 +714,17 @@ class Lexer:
             # Two-character operators
             if self.peek() and self.peek(1):
                 two_char = self.peek() + self.peek(1)
-                token_map = {
-                    '==': TokenType.EQ,
-                    '!=': TokenType.NE,
-                    '<=': TokenType.LE,
-                    '>=': TokenType.GE,
-                    '//': TokenType.FLOORDIV,
-                }
-                if two_char in token_map:
+                if two_char in TWO_CHAR_TOKENS:
                     col = self.column
                     self.advance()
                     self.advance()
-                    self.tokens.append(Token(token_map[two_char], two_char, self.line, col))
+                    self.tokens.append(Token(TWO_CHAR_TOKENS[two_char], two_char, self.line, col))
                     continue
 
             # Single-character tokens
-            single_char_tokens = {
-                ':': TokenType.COLON,
-                '(': TokenType.LPAREN,
-                ')': TokenType.RPAREN,
-                '[': TokenType.LBRACKET,
-                ']': TokenType.RBRACKET,
-                '{': TokenType.LBRACE,
-                '}': TokenType.RBRACE,
-                ',': TokenType.COMMA,
-                '=': TokenType.ASSIGN,
-                '+': TokenType.PLUS,
-                '-': TokenType.MINUS,
-                '*': TokenType.MULTIPLY,
-                '/': TokenType.DIVIDE,
-                '%': TokenType.MODULO,
-                '<': TokenType.LT,
-                '>': TokenType.GT,
-                '.': TokenType.DOT,
-            }
-
-            if char in single_char_tokens:
+            if char in SINGLE_CHAR_TOKENS:
                 col = self.column
-                token_type = single_char_tokens[char]
+                token_type = SINGLE_CHAR_TOKENS[char]
 
                 # Track nesting depth for proper indentation handling
                 if token_type == TokenType.LBRACE:
@@ -1,93 +1,174 @@
-from typing import List, Optional
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from lexer import Token, TokenType, Lexer
 from ast_nodes import *
 
+# Furthest peek_token offset used by the grammar. The token list is padded
+# with this many extra EOF tokens so lookahead never runs off the end.
+MAX_LOOKAHEAD = 2
+
+# Binary operators as (precedence, operator), loosest first. Comparisons
+# bind loosest, then 'and', then 'or'; every level is left-associative.
+BINARY_OPERATORS = {
+    TokenType.EQ: (1, '=='), TokenType.NE: (1, '!='),
+    TokenType.LT: (1, '<'), TokenType.GT: (1, '>'),
+    TokenType.LE: (1, '<='), TokenType.GE: (1, '>='),
+    TokenType.IN: (1, 'in'), TokenType.NOT: (1, 'not'), TokenType.IS: (1, 'is'),
+    TokenType.AND: (2, 'and'),
+    TokenType.OR: (3, 'or'),
+    TokenType.PLUS: (4, '+'), TokenType.MINUS: (4, '-'),
+    TokenType.MULTIPLY: (5, '*'), TokenType.DIVIDE: (5, '/'),
+    TokenType.MODULO: (5, '%'), TokenType.FLOORDIV: (5, '//'),
+}
+
+# Keyword members that name block operations (block.start, block.stop, ...)
+# and the node each one builds
+BLOCK_OPERATION_NODES = {
+    TokenType.START: StartExpression,
+    TokenType.STOP: StopExpression,
+    TokenType.SAVE: SaveExpression,
+    TokenType.SAVESTOP: SaveStopExpression,
+    TokenType.STARTSAVE: StartSaveExpression,
+    TokenType.DISCARD: DiscardExpression,
+}
+# Tokens that end a statement body, a line, or a statement
+BODY_END = frozenset({TokenType.DEDENT, TokenType.EOF})
+LINE_END = frozenset({TokenType.NEWLINE, TokenType.EOF})
+STATEMENT_END = frozenset({TokenType.NEWLINE, TokenType.EOF, TokenType.DEDENT})
+# Tokens that end the stop part of a slice
+SLICE_STOP_END = frozenset({TokenType.COLON, TokenType.RBRACKET})
+
 class Parser:
-    def __init__(self, tokens: List[Token]):
-        self.tokens = tokens
+    def __init__(self, tokens: Iterable[Token]):
+        # Any token iterable works (a list from Lexer.tokenize, a generator);
+        # it is collected once, since the parser indexes tokens directly
+        self.tokens = list(tokens)
+        if not self.tokens or self.tokens[-1].type != TokenType.EOF:
+            raise ValueError("Parser expects tokens ending in EOF")
+        self.tokens.extend([self.tokens[-1]] * MAX_LOOKAHEAD)
+        self.types = [token.type for token in self.tokens]  # Token types by position
+        self.after_newlines = self._newline_skips(self.types)
         self.pos = 0
         self.paren_depth = 0  # Track parenthesis nesting
+        self.layout: List[Tuple[int, ASTNode]] = []  # Top-level (start line, node) pairs
+        self.constants: Dict[Tuple[type, type, Any], Expression] = {}  # Shared literal nodes
 
     def current_token(self) -> Token:
-        if self.pos < len(self.tokens):
-            return self.tokens[self.pos]
-        return self.tokens[-1]  # Return EOF
+        return self.tokens[self.pos]
 
     def peek_token(self, offset=1) -> Token:
-        pos = self.pos + offset
-        if pos < len(self.tokens):
-            return self.tokens[pos]
-        return self.tokens[-1]
+        return self.tokens[self.pos + offset]
 
     def advance(self) -> Token:
-        token = self.current_token()
+        token = self.tokens[self.pos]
         self.pos += 1
         return token
 
     def expect(self, token_type: TokenType) -> Token:
-        token = self.current_token()
-        if token.type != token_type:
+        pos = self.pos
+        token = self.tokens[pos]
+        if self.types[pos] != token_type:
             raise SyntaxError(f"Expected {token_type}, got {token.type} at line {token.line}")
-        return self.advance()
+        self.pos = pos + 1
+        return token
+
+    def literal(self, node_class: type, value: Any) -> Expression:
+        """Return the program's shared literal node for a value.
+
+        Identical literals share one node (and one value object), and string
+        values are interned so equality checks between them are pointer
+        compares. Keyed on the value's type so 1, 1.0 and True stay distinct.
+        """
+        key = (node_class, type(value), value)
+        node = self.constants.get(key)
+        if node is None:
+            if type(value) is str:
+                value = sys.intern(value)
+            node = node_class(value)
+            self.constants[key] = node
+        return node
+
+    @staticmethod
+    def _newline_skips(types: List[TokenType]) -> List[int]:
+        """Map each position to the first non-NEWLINE position at or after it"""
+        skips = [0] * len(types)
+        target = len(types) - 1  # The padding EOF
+        for pos in range(len(types) - 1, -1, -1):
+            if types[pos] != TokenType.NEWLINE:
+                target = pos
+            skips[pos] = target
+        return skips
 
     def skip_newlines(self):
-        while self.current_token().type == TokenType.NEWLINE:
-            self.advance()
+        self.pos = self.after_newlines[self.pos]
 
     def parse(self) -> Program:
         declarations = []
         blocks = []
         main = None
 
-        while self.current_token().type != TokenType.EOF:
-            self.skip_newlines()
-
-            if self.current_token().type == TokenType.EOF:
-                break
-
-            # Check for main block
-            if self.current_token().type == TokenType.MAIN:
+        for _, node in self.parse_items():
+            if isinstance(node, MainBlock):
                 if main is not None:
                     raise SyntaxError("Multiple main blocks defined")
-                main = self.parse_main_block()
-            # Check for block definitions
-            elif self.current_token().type in [TokenType.OS, TokenType.DE, TokenType.FO, TokenType.PARALLEL]:
-                blocks.append(self.parse_block())
-            # Check for function declarations
-            elif self.current_token().type == TokenType.DEF:
-                declarations.append(self.parse_function())
-            # Check for class declarations
-            elif self.current_token().type == TokenType.CLASS:
-                declarations.append(self.parse_class())
-            # Check for import statements
-            elif self.current_token().type == TokenType.IMPORT:
-                declarations.append(self.parse_import())
-            elif self.current_token().type == TokenType.FROM:
-                declarations.append(self.parse_from_import())
-            # Variable declarations or assignments
-            elif self.current_token().type == TokenType.IDENTIFIER:
-                # Check for tuple unpacking at global level
-                if self.peek_token().type == TokenType.COMMA:
-                    # Parse tuple unpacking: a, b, c = expr
-                    # We need to handle this specially at the declaration level
-                    # For now, let's create it as a special VarDeclaration with tuple unpacking
-                    stmt = self.parse_statement()  # This will parse it as TupleUnpackingAssignment
-                    # Convert it to declarations - we'll handle it in the interpreter
-                    declarations.append(stmt)
-                elif self.peek_token().type == TokenType.ASSIGN:
-                    declarations.append(self.parse_var_declaration())
-                else:
-                    raise SyntaxError(f"Unexpected identifier at line {self.current_token().line}")
+                main = node
+            elif isinstance(node, Block):
+                blocks.append(node)
             else:
-                raise SyntaxError(f"Unexpected token {self.current_token().type} at line {self.current_token().line}")
-
-            self.skip_newlines()
+                declarations.append(node)
 
         if main is None:
             raise SyntaxError("No main block defined")
 
         return Program(declarations, blocks, main)
 
+    def parse_items(self) -> List[Tuple[int, ASTNode]]:
+        """Parse all top-level items as (start line, node) pairs in source order.
+
+        The layout is also kept on self.layout so callers (hot reload) can map
+        source lines back to declarations and blocks.
+        """
+        items = []
+        types = self.types
+        after_newlines = self.after_newlines
+
+        self.pos = after_newlines[self.pos]
+        while types[self.pos] != TokenType.EOF:
+            line = self.current_token().line
+            try:
+                items.append((line, self.parse_top_level()))
+            except RecursionError:
+                # Report runaway nesting as a syntax error rather than a crash
+                raise SyntaxError(f"Too deeply nested in item starting at line {line} "
+                                  f"(stopped near line {self.current_token().line})") from None
+
+            self.pos = after_newlines[self.pos]
+
+        self.layout = items
+        return items
+
+    def parse_top_level(self) -> ASTNode:
+        """Parse a single top-level item: main, a block, or a declaration"""
+        handler = TOP_LEVEL_PARSERS.get(self.types[self.pos])
+        if handler is None:
+            raise SyntaxError(f"Unexpected token {self.types[self.pos]} at line {self.current_token().line}")
+        return handler(self)
+
+    def parse_top_level_identifier(self) -> ASTNode:
+        """Parse a global variable declaration or tuple unpacking"""
+        # Check for tuple unpacking at global level
+        if self.peek_token().type == TokenType.COMMA:
+            # Parse tuple unpacking: a, b, c = expr
+            # We need to handle this specially at the declaration level
+            # For now, let's create it as a special VarDeclaration with tuple unpacking
+            # This will parse it as TupleUnpackingAssignment
+            # Convert it to declarations - we'll handle it in the interpreter
+            return self.parse_statement()
+        elif self.peek_token().type == TokenType.ASSIGN:
+            return self.parse_var_declaration()
+        else:
+            raise SyntaxError(f"Unexpected identifier at line {self.current_token().line}")
+
     def parse_main_block(self) -> MainBlock:
         self.expect(TokenType.MAIN)
         self.expect(TokenType.COLON)
@@ -102,31 +183,55 @@ class Parser:
 
     def parse_block(self) -> Block:
         parallel = False
-        if self.current_token().type == TokenType.PARALLEL:
+        if self.types[self.pos] == TokenType.PARALLEL:
             parallel = True
-            self.advance()
+            self.pos += 1
 
-        block_type = self.current_token().type
-        self.advance()
+        block_type = self.types[self.pos]
+        self.pos += 1
 
         name_token = self.expect(TokenType.IDENTIFIER)
         name = name_token.value
     
         # Handle parentheses for all block types (optional for OS/FO, required for DE)
         iterations = None
-        if self.current_token().type == TokenType.LPAREN:
-            self.advance()
+        tick = None
+        process = False
+        if self.types[self.pos] == TokenType.LPAREN:
+            self.pos += 1
             if block_type == TokenType.DE:
                 # Check if it's a number or identifier
-                if self.current_token().type == TokenType.NUMBER:
+                if self.types[self.pos] == TokenType.NUMBER:
                     iterations = int(self.current_token().value)
-                    self.advance()
-                elif self.current_token().type == TokenType.IDENTIFIER:
+                    self.pos += 1
+                elif self.types[self.pos] == TokenType.IDENTIFIER:
                     # Store variable name as string
                     iterations = self.current_token().value
-                    self.advance()
+                    self.pos += 1
                 else:
-                    raise SyntaxError(f"DE block requires iteration count or variable, got {self.current_token().type}")
+                    raise SyntaxError(f"DE block requires iteration count or variable, got {self.types[self.pos]}")
+                if self.types[self.pos] == TokenType.COMMA:
+                    self.pos += 1
+            # Optional settings: tick=<seconds> (delay between iterations of a
+            # parallel block) and, for DE blocks, process=True
+            while self.types[self.pos] == TokenType.IDENTIFIER:
+                option = self.tokens[self.pos].value
+                self.pos += 1
+                if block_type == TokenType.OS:
+                    raise SyntaxError(f"OS block '{name}' does not take '{option}'")
+                self.expect(TokenType.ASSIGN)
+                if option == 'tick':
+                    tick = float(self.expect(TokenType.NUMBER).value)
+                elif option == 'process' and block_type == TokenType.DE:
+                    if self.types[self.pos] == TokenType.TRUE:
+                        process = True
+                    elif self.types[self.pos] != TokenType.FALSE:
+                        raise SyntaxError(f"process expects True or False at line {self.current_token().line}")
+                    self.pos += 1
+                else:
+                    raise SyntaxError(f"Unknown block option '{option}' for block '{name}'")
+                if self.types[self.pos] == TokenType.COMMA:
+                    self.pos += 1
             self.expect(TokenType.RPAREN)
         elif block_type == TokenType.DE:
             raise SyntaxError(f"DE block '{name}' requires iteration count in parentheses")
@@ -143,34 +248,19 @@ class Parser:
             return OSBlock(name, body)
         elif block_type == TokenType.DE:
             if parallel:
-                return ParallelDEBlock(name, body, iterations)
-            return DEBlock(name, body, iterations)
+                return ParallelDEBlock(name, body, iterations, tick, process)
+            return DEBlock(name, body, iterations, tick, process)
         elif block_type == TokenType.FO:
             if parallel:
-                return ParallelFOBlock(name, body)
-            return FOBlock(name, body)
+                return ParallelFOBlock(name, body, tick)
+            return FOBlock(name, body, tick)
 
     def parse_function(self) -> FuncDeclaration:
         self.expect(TokenType.DEF)
         name = self.expect(TokenType.IDENTIFIER).value
         self.expect(TokenType.LPAREN)
 
-        params = []
-        while self.current_token().type != TokenType.RPAREN:
-            param_name = self.expect(TokenType.IDENTIFIER).value
-            default_value = None
-
-            # Check for default parameter
-            if self.current_token().type == TokenType.ASSIGN:
-                self.advance()
-                default_value = self.parse_expression()
-
-            params.append(Parameter(param_name, default_value))
-
-            if self.current_token().type == TokenType.COMMA:
-                self.advance()
-
-        self.expect(TokenType.RPAREN)
+        params = self._parse_comma_list(self.parse_parameter, TokenType.RPAREN)
         self.expect(TokenType.COLON)
         self.skip_newlines()
         self.expect(TokenType.INDENT)
@@ -181,16 +271,28 @@ class Parser:
 
         return FuncDeclaration(name, params, body)
 
+    def parse_parameter(self) -> Parameter:
+        param_name = self.expect(TokenType.IDENTIFIER).value
+        default_value = None
+
+        # Check for default parameter
+        if self.types[self.pos] == TokenType.ASSIGN:
+            self.pos += 1
+            default_value = self.parse_expression()
+
+        return Parameter(param_name, default_value)
+
     def parse_class(self) -> ClassDeclaration:
         self.expect(TokenType.CLASS)
         class_name = self.expect(TokenType.IDENTIFIER).value
 
         # Check for base class
         base_class = None
-        if self.current_token().type == TokenType.LPAREN:
-            self.advance()
-            if self.current_token().type == TokenType.IDENTIFIER:
-                base_class = self.advance().value
+        if self.types[self.pos] == TokenType.LPAREN:
+            self.pos += 1
+            if self.types[self.pos] == TokenType.IDENTIFIER:
+                base_class = self.tokens[self.pos].value
+                self.pos += 1
             self.expect(TokenType.RPAREN)
 
         self.expect(TokenType.COLON)
@@ -200,26 +302,27 @@ class Parser:
         methods = []
         attributes = []
 
-        while self.current_token().type != TokenType.DEDENT:
+        while self.types[self.pos] != TokenType.DEDENT:
             self.skip_newlines()
 
-            if self.current_token().type == TokenType.DEF:
+            if self.types[self.pos] == TokenType.DEF:
                 # Parse method
                 methods.append(self.parse_function())
-            elif self.current_token().type == TokenType.IDENTIFIER:
+            elif self.types[self.pos] == TokenType.IDENTIFIER:
                 # Parse attribute
                 if self.peek_token().type == TokenType.ASSIGN:
-                    name = self.advance().value
+                    name = self.tokens[self.pos].value
+                    self.pos += 1
                     self.expect(TokenType.ASSIGN)
                     value = self.parse_expression()
                     attributes.append(VarDeclaration(name, value))
                     self.skip_newlines()
                 else:
                     raise SyntaxError(f"Unexpected identifier in class body at line {self.current_token().line}")
-            elif self.current_token().type == TokenType.DEDENT:
+            elif self.types[self.pos] == TokenType.DEDENT:
                 break
             else:
-                raise SyntaxError(f"Unexpected token in class body: {self.current_token().type} at line {self.current_token().line}")
+                raise SyntaxError(f"Unexpected token in class body: {self.types[self.pos]} at line {self.current_token().line}")
 
         self.expect(TokenType.DEDENT)
 
@@ -237,14 +340,14 @@ class Parser:
 
         # Parse dotted module name (e.g., urllib.request)
         module_parts = [self.expect(TokenType.IDENTIFIER).value]
-        while self.current_token().type == TokenType.DOT:
-            self.advance()  # consume dot
+        while self.types[self.pos] == TokenType.DOT:
+            self.pos += 1  # consume dot
             module_parts.append(self.expect(TokenType.IDENTIFIER).value)
         module = '.'.join(module_parts)
 
         alias = None
-        if self.current_token().type == TokenType.AS:
-            self.advance()
+        if self.types[self.pos] == TokenType.AS:
+            self.pos += 1
             alias = self.expect(TokenType.IDENTIFIER).value
 
         self.skip_newlines()
@@ -255,8 +358,8 @@ class Parser:
 
         # Parse dotted module name (e.g., urllib.parse)
         module_parts = [self.expect(TokenType.IDENTIFIER).value]
-        while self.current_token().type == TokenType.DOT:
-            self.advance()  # consume dot
+        while self.types[self.pos] == TokenType.DOT:
+            self.pos += 1  # consume dot
             module_parts.append(self.expect(TokenType.IDENTIFIER).value)
         module = '.'.join(module_parts)
 
@@ -267,18 +370,18 @@ class Parser:
 
         # Parse first name
         names.append(self.expect(TokenType.IDENTIFIER).value)
-        if self.current_token().type == TokenType.AS:
-            self.advance()
+        if self.types[self.pos] == TokenType.AS:
+            self.pos += 1
             aliases.append(self.expect(TokenType.IDENTIFIER).value)
         else:
             aliases.append(None)
 
         # Parse additional names
-        while self.current_token().type == TokenType.COMMA:
-            self.advance()
+        while self.types[self.pos] == TokenType.COMMA:
+            self.pos += 1
             names.append(self.expect(TokenType.IDENTIFIER).value)
-            if self.current_token().type == TokenType.AS:
-                self.advance()
+            if self.types[self.pos] == TokenType.AS:
+                self.pos += 1
                 aliases.append(self.expect(TokenType.IDENTIFIER).value)
             else:
                 aliases.append(None)
@@ -288,60 +391,63 @@ class Parser:
 
     def parse_statements(self) -> List[Statement]:
         statements = []
-        while self.current_token().type not in [TokenType.DEDENT, TokenType.EOF]:
-            self.skip_newlines()
-            if self.current_token().type == TokenType.DEDENT:
-                break
+        types = self.types
+        after_newlines = self.after_newlines
+
+        # Blank lines are skipped inline (skip_newlines) before each statement
+        self.pos = after_newlines[self.pos]
+        while types[self.pos] not in BODY_END:
             stmt = self.parse_statement()
             if stmt:
                 statements.append(stmt)
-            self.skip_newlines()
+            self.pos = after_newlines[self.pos]
         return statements
 
     def parse_statement(self) -> Optional[Statement]:
-        token = self.current_token()
-        if token.type == TokenType.WHEN:
+        token_type = self.types[self.pos]
+        if token_type == TokenType.WHEN:
             return self.parse_when_statement()
-        elif token.type == TokenType.WITH:
+        elif token_type == TokenType.WITH:
             return self.parse_with_statement()
-        elif token.type == TokenType.BREAK:
-            self.advance()
-            return BreakStatement()
-        elif token.type == TokenType.CONTINUE:
-            self.advance()
-            return ContinueStatement()
-        elif token.type == TokenType.EXIT:
-            self.advance()
-            return ExitStatement()
-        elif token.type == TokenType.PASS:
-            self.advance()
-            return PassStatement()
-        elif token.type == TokenType.RETURN:
-            self.advance()
+        elif token_type == TokenType.BREAK:
+            self.pos += 1
+            return BREAK_STATEMENT
+        elif token_type == TokenType.CONTINUE:
+            self.pos += 1
+            return CONTINUE_STATEMENT
+        elif token_type == TokenType.EXIT:
+            self.pos += 1
+            return EXIT_STATEMENT
+        elif token_type == TokenType.PASS:
+            self.pos += 1
+            return PASS_STATEMENT
+        elif token_type == TokenType.RETURN:
+            self.pos += 1
             values = []
-            if self.current_token().type not in [TokenType.NEWLINE, TokenType.EOF]:
+            if self.types[self.pos] not in LINE_END:
                 values.append(self.parse_expression())
-                while self.current_token().type == TokenType.COMMA:
-                    self.advance()
+                while self.types[self.pos] == TokenType.COMMA:
+                    self.pos += 1
                     values.append(self.parse_expression())
             return ReturnStatement(values)
-        elif token.type == TokenType.GLOBAL:
-            self.advance()
+        elif token_type == TokenType.GLOBAL:
+            self.pos += 1
             names = []
             names.append(self.expect(TokenType.IDENTIFIER).value)
-            while self.current_token().type == TokenType.COMMA:
-                self.advance()
+            while self.types[self.pos] == TokenType.COMMA:
+                self.pos += 1
                 names.append(self.expect(TokenType.IDENTIFIER).value)
             return GlobalStatement(names)
-        elif token.type == TokenType.IDENTIFIER:
+        elif token_type == TokenType.IDENTIFIER:
             # Check for tuple unpacking: a, b = expr
             if self.peek_token().type == TokenType.COMMA:
                 # Parse tuple unpacking targets
                 targets = []
-                targets.append(self.advance().value)  # Get first identifier
+                targets.append(self.tokens[self.pos].value)  # Get first identifier
+                self.pos += 1
 
-                while self.current_token().type == TokenType.COMMA:
-                    self.advance()  # Skip comma
+                while self.types[self.pos] == TokenType.COMMA:
+                    self.pos += 1  # Skip comma
                     targets.append(self.expect(TokenType.IDENTIFIER).value)
 
                 self.expect(TokenType.ASSIGN)
@@ -351,10 +457,10 @@ class Parser:
                 values.append(self.parse_expression())
 
                 # Check if there are more comma-separated values on the right
-                while self.current_token().type == TokenType.COMMA:
-                    self.advance()  # Skip comma
+                while self.types[self.pos] == TokenType.COMMA:
+                    self.pos += 1  # Skip comma
                     # Only continue if not at end of statement
-                    if self.current_token().type not in [TokenType.NEWLINE, TokenType.EOF, TokenType.DEDENT]:
+                    if self.types[self.pos] not in STATEMENT_END:
                         values.append(self.parse_expression())
                     else:
                         break
@@ -370,17 +476,23 @@ class Parser:
             # Check for simple assignment shortcut
             elif self.peek_token().type == TokenType.ASSIGN:
                 # Simple assignment: var = value
-                name = self.advance().value
-                self.advance()  # skip =
+                name = self.tokens[self.pos].value
+                self.pos += 1
+                self.pos += 1  # skip =
                 value = self.parse_expression()
                 return Assignment(name, value)
             else:
-                # Parse as expression and check if it's an assignment target
-                expr = self.parse_expression()
+                # Parse as expression and check if it's an assignment target.
+                # Most are a bare name or call (foo, foo(x), obj.m(x)), so
+                # when the statement ends right after one, skip operator parsing
+                expr = self.parse_postfix()
+                if self.types[self.pos] in STATEMENT_END:
+                    return ExpressionStatement(expr)
+                expr = self.parse_ternary(expr)
 
                 # Check if this expression is followed by an assignment
-                if self.current_token().type == TokenType.ASSIGN:
-                    self.advance()  # skip =
+                if self.types[self.pos] == TokenType.ASSIGN:
+                    self.pos += 1  # skip =
                     value = self.parse_expression()
 
                     # Determine what kind of assignment this is
@@ -420,8 +532,8 @@ class Parser:
         context_expr = self.parse_expression()
 
         var_name = None
-        if self.current_token().type == TokenType.AS:
-            self.advance()
+        if self.types[self.pos] == TokenType.AS:
+            self.pos += 1
             var_name = self.expect(TokenType.IDENTIFIER).value
 
         self.expect(TokenType.COLON)
@@ -437,20 +549,21 @@ class Parser:
     def parse_expression(self) -> Expression:
         return self.parse_ternary()
 
-    def parse_ternary(self) -> Expression:
+    def parse_ternary(self, left: Optional[Expression] = None) -> Expression:
+        """Parse an expression, continuing from an already parsed first operand if given"""
         # Parse the main expression (which could be the true_expr in ternary)
-        expr = self.parse_comparison()
+        expr = self.parse_binary(1, left)
 
         # Only skip newlines if we're inside parentheses
         if self.paren_depth > 0:
             self.skip_newlines()
 
         # Check for ternary operator: expr when condition else false_expr
-        if self.current_token().type == TokenType.WHEN:
-            self.advance()  # consume 'when'
+        if self.types[self.pos] == TokenType.WHEN:
+            self.pos += 1  # consume 'when'
             self.skip_newlines()  # Allow newlines after 'when'
 
-            condition = self.parse_comparison()
+            condition = self.parse_binary()
             self.skip_newlines()  # Allow newlines before 'else'
 
             self.expect(TokenType.ELSE)
@@ -461,93 +574,47 @@ class Parser:
 
         return expr
 
-    def parse_comparison(self) -> Expression:
-        left = self.parse_logical_and()
+    def parse_binary(self, min_prec: int = 1, left: Optional[Expression] = None) -> Expression:
+        """Parse a chain of binary operators binding at least as tightly as min_prec"""
+        if left is None:
+            left = self.parse_unary()
+        types = self.types
 
-        while self.current_token().type in [TokenType.EQ, TokenType.NE, TokenType.LT,
-                                           TokenType.GT, TokenType.LE, TokenType.GE, TokenType.IN, TokenType.NOT, TokenType.IS]:
-
-            # Handle "not in" compound operator
-            if self.current_token().type == TokenType.NOT and self.peek_token().type == TokenType.IN:
-                self.advance()  # consume "not"
-                self.advance()  # consume "in"
+        while True:
+            token_type = types[self.pos]
+            operator = BINARY_OPERATORS.get(token_type)
+            if operator is None or operator[0] < min_prec:
+                return left
+            prec, op = operator
+
+            # Handle "not in" and "is not" compound operators
+            if token_type == TokenType.NOT and types[self.pos + 1] == TokenType.IN:
+                self.pos += 2
                 op = "not in"
-                right = self.parse_logical_and()
-                left = BinaryOp(left, op, right)
-            # Handle "is not" compound operator
-            elif self.current_token().type == TokenType.IS and self.peek_token().type == TokenType.NOT:
-                self.advance()  # consume "is"
-                self.advance()  # consume "not"
+            elif token_type == TokenType.IS and types[self.pos + 1] == TokenType.NOT:
+                self.pos += 2
                 op = "is not"
-                right = self.parse_logical_and()
-                left = BinaryOp(left, op, right)
-            # Handle regular "is"
-            elif self.current_token().type == TokenType.IS:
-                self.advance()  # consume "is"
-                op = "is"
-                right = self.parse_logical_and()
-                left = BinaryOp(left, op, right)
             else:
-                op_token = self.advance()
-                op = op_token.value if op_token.value else op_token.type.name.lower()
-                right = self.parse_logical_and()
-                left = BinaryOp(left, op, right)
-
-        return left
-
-    def parse_logical_and(self) -> Expression:
-        left = self.parse_logical_or()
-
-        while self.current_token().type == TokenType.AND:
-            op = self.advance().value
-            right = self.parse_logical_or()
-            left = BinaryOp(left, op, right)
-
-        return left
-
-    def parse_logical_or(self) -> Expression:
-        left = self.parse_addition()
+                self.pos += 1
 
-        while self.current_token().type == TokenType.OR:
-            op = self.advance().value
-            right = self.parse_addition()
+            right = self.parse_binary(prec + 1)
             left = BinaryOp(left, op, right)
 
-        return left
-
-    def parse_addition(self) -> Expression:
-        left = self.parse_multiplication()
-
-        while self.current_token().type in [TokenType.PLUS, TokenType.MINUS]:
-            op = self.advance().value
-            right = self.parse_multiplication()
-            left = BinaryOp(left, op, right)
-
-        return left
-
-    def parse_multiplication(self) -> Expression:
-        left = self.parse_unary()
-
-        while self.current_token().type in [TokenType.MULTIPLY, TokenType.DIVIDE, TokenType.MODULO, TokenType.FLOORDIV]:
-            op = self.advance().value
-            right = self.parse_unary()
-            left = BinaryOp(left, op, right)
-
-        return left
-
     def parse_unary(self) -> Expression:
-        if self.current_token().type == TokenType.MINUS:
-            op = self.advance().value
+        if self.types[self.pos] == TokenType.MINUS:
+            op = self.tokens[self.pos].value
+            self.pos += 1
             operand = self.parse_unary()
             return UnaryOp(op, operand)
-        elif self.current_token().type == TokenType.NOT:
+        elif self.types[self.pos] == TokenType.NOT:
             # Check for "not in" compound operator
             if self.peek_token().type == TokenType.IN:
                 # This is "not in" - let the comparison parser handle it
                 return self.parse_postfix()
             else:
                 # Regular "not" unary operator
-                op = self.advance().value
+                op = self.tokens[self.pos].value
+                self.pos += 1
                 operand = self.parse_unary()
                 return UnaryOp(op, operand)
         return self.parse_postfix()
@@ -556,8 +623,8 @@ class Parser:
         expr = self.parse_primary()
 
         while True:
-            if self.current_token().type == TokenType.LBRACKET:
-                self.advance()
+            if self.types[self.pos] == TokenType.LBRACKET:
+                self.pos += 1
 
                 # Check for slice syntax
                 start = None
@@ -566,22 +633,22 @@ class Parser:
                 is_slice = False
 
                 # Parse start (or could be a regular index)
-                if self.current_token().type != TokenType.COLON:
+                if self.types[self.pos] != TokenType.COLON:
                     start = self.parse_expression()
 
                 # Check if this is a slice
-                if self.current_token().type == TokenType.COLON:
+                if self.types[self.pos] == TokenType.COLON:
                     is_slice = True
-                    self.advance()  # Skip colon
+                    self.pos += 1  # Skip colon
 
                     # Parse stop
-                    if self.current_token().type not in [TokenType.COLON, TokenType.RBRACKET]:
+                    if self.types[self.pos] not in SLICE_STOP_END:
                         stop = self.parse_expression()
 
                     # Check for step
-                    if self.current_token().type == TokenType.COLON:
-                        self.advance()  # Skip second colon
-                        if self.current_token().type != TokenType.RBRACKET:
+                    if self.types[self.pos] == TokenType.COLON:
+                        self.pos += 1  # Skip second colon
+                        if self.types[self.pos] != TokenType.RBRACKET:
                             step = self.parse_expression()
 
                 self.expect(TokenType.RBRACKET)
@@ -591,116 +658,71 @@ class Parser:
                 else:
                     # Regular index expression
                     expr = IndexExpression(expr, start)
-            elif self.current_token().type == TokenType.DOT:
-                self.advance()
-
-                # Check if next token is a keyword that would normally be an identifier
-                if self.current_token().type in [TokenType.START, TokenType.STOP, TokenType.SAVE, TokenType.SAVESTOP, TokenType.STARTSAVE, TokenType.DISCARD]:
-                    keyword_token = self.advance()
-                    member = keyword_token.value
+            elif self.types[self.pos] == TokenType.DOT:
+                self.pos += 1
+
+                # Block operations (name.start, name.stop, ...) are keywords
+                node_class = BLOCK_OPERATION_NODES.get(self.types[self.pos])
+                if node_class is not None:
+                    member = self.tokens[self.pos].value
+                    self.pos += 1
+                    if isinstance(expr, Identifier):
+                        if self.types[self.pos] == TokenType.LPAREN:
+                            self.pos += 1
+                            self.expect(TokenType.RPAREN)
+                        return node_class(expr.name)
                 else:
-                    member_token = self.expect(TokenType.IDENTIFIER)
-                    member = member_token.value
-
-                # Handle special block operations
-                if member == "start" and isinstance(expr, Identifier):
-                    if self.current_token().type == TokenType.LPAREN:
-                        self.advance()
-                        self.expect(TokenType.RPAREN)
-                    return StartExpression(expr.name)
-                elif member == "stop" and isinstance(expr, Identifier):
-                    if self.current_token().type == TokenType.LPAREN:
-                        self.advance()
-                        self.expect(TokenType.RPAREN)
-                    return StopExpression(expr.name)
-                elif member == "save" and isinstance(expr, Identifier):
-                    if self.current_token().type == TokenType.LPAREN:
-                        self.advance()
-                        self.expect(TokenType.RPAREN)
-                    return SaveExpression(expr.name)
-                elif member == "savestop" and isinstance(expr, Identifier):
-                    if self.current_token().type == TokenType.LPAREN:
-                        self.advance()
-                        self.expect(TokenType.RPAREN)
-                    return SaveStopExpression(expr.name)
-                elif member == "startsave" and isinstance(expr, Identifier):
-                    if self.current_token().type == TokenType.LPAREN:
-                        self.advance()
-                        self.expect(TokenType.RPAREN)
-                    return StartSaveExpression(expr.name)
-                elif member == "discard" and isinstance(expr, Identifier):
-                    if self.current_token().type == TokenType.LPAREN:
-                        self.advance()
-                        self.expect(TokenType.RPAREN)
-                    return DiscardExpression(expr.name)
+                    member = self.expect(TokenType.IDENTIFIER).value
+
+                # Check if this is a method call
+                if self.types[self.pos] == TokenType.LPAREN:
+                    self.pos += 1
+                    args, kwargs = self.parse_call_args()
+                    # Create method call with current expression as object
+                    expr = MethodCall(expr, member, args, kwargs)
                 else:
-                    # Check if this is a method call
-                    if self.current_token().type == TokenType.LPAREN:
-                        self.advance()
-                        args = []
-                        kwargs = []
-
-                        while self.current_token().type != TokenType.RPAREN:
-                            # Check if this is a keyword argument (identifier=value)
-                            if (self.current_token().type == TokenType.IDENTIFIER and
-                                self.peek_token().type == TokenType.ASSIGN):
-
-                                kw_name = self.advance().value
-                                self.advance()  # consume =
-                                kw_value = self.parse_expression()
-                                kwargs.append(KeywordArg(kw_name, kw_value))
-                            else:
-                                # Regular positional argument
-                                args.append(self.parse_expression())
-
-                            if self.current_token().type == TokenType.COMMA:
-                                self.advance()
-
-                        self.expect(TokenType.RPAREN)
-                        # Create method call with current expression as object
-                        expr = MethodCall(expr, member, args, kwargs if kwargs else None)
-                    else:
-                        # Regular member access
-                        expr = MemberAccess(expr, member)
+                    # Regular member access
+                    expr = MemberAccess(expr, member)
             else:
                 break
 
         return expr
 
     def parse_primary(self) -> Expression:
-        token = self.current_token()
-
-        if token.type == TokenType.NUMBER:
-            self.advance()
-            return NumberLiteral(token.value)
-        elif token.type == TokenType.STRING:
-            self.advance()
-            return StringLiteral(token.value)
-        elif token.type == TokenType.FSTRING:
-            self.advance()
+        token = self.tokens[self.pos]
+        token_type = self.types[self.pos]
+
+        if token_type == TokenType.NUMBER:
+            self.pos += 1
+            return self.literal(NumberLiteral, token.value)
+        elif token_type == TokenType.STRING:
+            self.pos += 1
+            return self.literal(StringLiteral, token.value)
+        elif token_type == TokenType.FSTRING:
+            self.pos += 1
             return FStringLiteral(token.value)
-        elif token.type == TokenType.TRUE:
-            self.advance()
-            return BooleanLiteral(True)
-        elif token.type == TokenType.FALSE:
-            self.advance()
-            return BooleanLiteral(False)
-        elif token.type == TokenType.NONE:
-            self.advance()
-            return NoneLiteral()
-        elif token.type == TokenType.LBRACKET:
+        elif token_type == TokenType.TRUE:
+            self.pos += 1
+            return self.literal(BooleanLiteral, True)
+        elif token_type == TokenType.FALSE:
+            self.pos += 1
+            return self.literal(BooleanLiteral, False)
+        elif token_type == TokenType.NONE:
+            self.pos += 1
+            return NONE_LITERAL
+        elif token_type == TokenType.LBRACKET:
             return self.parse_list()
-        elif token.type == TokenType.LBRACE:
+        elif token_type == TokenType.LBRACE:
             return self.parse_dict()
-        elif token.type == TokenType.LPAREN:
+        elif token_type == TokenType.LPAREN:
             # Check if this is a tuple or just a parenthesized expression
-            self.advance()
+            self.pos += 1
             self.paren_depth += 1  # Entering parentheses
             self.skip_newlines()  # Allow newlines after opening paren
 
             # Empty tuple case
-            if self.current_token().type == TokenType.RPAREN:
-                self.advance()
+            if self.types[self.pos] == TokenType.RPAREN:
+                self.pos += 1
                 self.paren_depth -= 1  # Exiting parentheses
                 return TupleLiteral([])
 
@@ -709,16 +731,16 @@ class Parser:
             self.skip_newlines()  # Allow newlines after expression
 
             # If we see a comma, it's definitely a tuple
-            if self.current_token().type == TokenType.COMMA:
+            if self.types[self.pos] == TokenType.COMMA:
                 elements = [first_expr]
-                self.advance()  # consume comma
+                self.pos += 1  # consume comma
 
                 # Parse remaining elements
-                while self.current_token().type != TokenType.RPAREN:
+                while self.types[self.pos] != TokenType.RPAREN:
                     elements.append(self.parse_expression())
-                    if self.current_token().type == TokenType.COMMA:
-                        self.advance()
-                    elif self.current_token().type != TokenType.RPAREN:
+                    if self.types[self.pos] == TokenType.COMMA:
+                        self.pos += 1
+                    elif self.types[self.pos] != TokenType.RPAREN:
                         break
 
                 self.expect(TokenType.RPAREN)
@@ -726,8 +748,8 @@ class Parser:
                 return TupleLiteral(elements)
             else:
                 # Single element in parentheses - check for trailing comma to disambiguate
-                if self.current_token().type == TokenType.COMMA:
-                    self.advance()  # consume trailing comma
+                if self.types[self.pos] == TokenType.COMMA:
+                    self.pos += 1  # consume trailing comma
                     self.expect(TokenType.RPAREN)
                     self.paren_depth -= 1  # Exiting parentheses
                     return TupleLiteral([first_expr])
@@ -736,113 +758,81 @@ class Parser:
                     self.expect(TokenType.RPAREN)
                     self.paren_depth -= 1  # Exiting parentheses
                     return first_expr
-        elif token.type == TokenType.IDENTIFIER:
-            name = self.advance().value
+        elif token_type == TokenType.IDENTIFIER:
+            name = token.value
+            types = self.types
+            self.pos += 1
+            next_type = types[self.pos]
 
             # Check for function call
-            if self.current_token().type == TokenType.LPAREN:
-                self.advance()
-                args = []
-                kwargs = []
-
-                while self.current_token().type != TokenType.RPAREN:
-                    # Check if this is a keyword argument (identifier=value)
-                    if (self.current_token().type == TokenType.IDENTIFIER and
-                        self.peek_token().type == TokenType.ASSIGN):
-
-                        kw_name = self.advance().value
-                        self.advance()  # consume =
-                        kw_value = self.parse_expression()
-                        kwargs.append(KeywordArg(kw_name, kw_value))
-                    else:
-                        # Regular positional argument
-                        args.append(self.parse_expression())
-
-                    if self.current_token().type == TokenType.COMMA:
-                        self.advance()
-
-                self.expect(TokenType.RPAREN)
-                return CallExpression(name, args, kwargs if kwargs else None)
+            if next_type == TokenType.LPAREN:
+                self.pos += 1
+                args, kwargs = self.parse_call_args()
+                return CallExpression(name, args, kwargs)
             # Check for member access (.start, .stop) or chained member/method access
-            elif self.current_token().type == TokenType.DOT:
+            elif next_type == TokenType.DOT:
                 expr = Identifier(name)
 
                 # Handle chained dot access
-                while self.current_token().type == TokenType.DOT:
-                    self.advance()
-
-                    # Check if next token is a keyword that would normally be an identifier
-                    if self.current_token().type in [TokenType.START, TokenType.STOP, TokenType.SAVE, TokenType.SAVESTOP, TokenType.STARTSAVE, TokenType.DISCARD]:
-                        member = self.advance().value
+                while types[self.pos] == TokenType.DOT:
+                    self.pos += 1
+
+                    # Block operations (name.start, name.stop, ...) are keywords
+                    node_class = BLOCK_OPERATION_NODES.get(types[self.pos])
+                    if node_class is not None:
+                        member = self.tokens[self.pos].value
+                        self.pos += 1
+                        if isinstance(expr, Identifier):
+                            if types[self.pos] == TokenType.LPAREN:
+                                self.pos += 1
+                                self.expect(TokenType.RPAREN)
+                            return node_class(expr.name)
                     else:
                         member = self.expect(TokenType.IDENTIFIER).value
 
-                    # Special handling for block operations
-                    if member == "start" and isinstance(expr, Identifier):
-                        if self.current_token().type == TokenType.LPAREN:
-                            self.advance()
-                            self.expect(TokenType.RPAREN)
-                        return StartExpression(expr.name)
-                    elif member == "stop" and isinstance(expr, Identifier):
-                        if self.current_token().type == TokenType.LPAREN:
-                            self.advance()
-                            self.expect(TokenType.RPAREN)
-                        return StopExpression(expr.name)
-                    elif member == "save" and isinstance(expr, Identifier):
-                        if self.current_token().type == TokenType.LPAREN:
-                            self.advance()
-                            self.expect(TokenType.RPAREN)
-                        return SaveExpression(expr.name)
-                    elif member == "savestop" and isinstance(expr, Identifier):
-                        if self.current_token().type == TokenType.LPAREN:
-                            self.advance()
-                            self.expect(TokenType.RPAREN)
-                        return SaveStopExpression(expr.name)
-                    elif member == "startsave" and isinstance(expr, Identifier):
-                        if self.current_token().type == TokenType.LPAREN:
-                            self.advance()
-                            self.expect(TokenType.RPAREN)
-                        return StartSaveExpression(expr.name)
-                    elif member == "discard" and isinstance(expr, Identifier):
-                        if self.current_token().type == TokenType.LPAREN:
-                            self.advance()
-                            self.expect(TokenType.RPAREN)
-                        return DiscardExpression(expr.name)
+                    # Check if this is a method call
+                    if types[self.pos] == TokenType.LPAREN:
+                        self.pos += 1
+                        args, kwargs = self.parse_call_args()
+                        # Create method call with current expression as object
+                        expr = MethodCall(expr, member, args, kwargs)
                     else:
-                        # Check if this is a method call
-                        if self.current_token().type == TokenType.LPAREN:
-                            self.advance()
-                            args = []
-                            kwargs = []
-
-                            while self.current_token().type != TokenType.RPAREN:
-                                # Check if this is a keyword argument (identifier=value)
-                                if (self.current_token().type == TokenType.IDENTIFIER and
-                                    self.peek_token().type == TokenType.ASSIGN):
-
-                                    kw_name = self.advance().value
-                                    self.advance()  # consume =
-                                    kw_value = self.parse_expression()
-                                    kwargs.append(KeywordArg(kw_name, kw_value))
-                                else:
-                                    # Regular positional argument
-                                    args.append(self.parse_expression())
-
-                                if self.current_token().type == TokenType.COMMA:
-                                    self.advance()
-
-                            self.expect(TokenType.RPAREN)
-                            # Create method call with current expression as object
-                            expr = MethodCall(expr, member, args, kwargs if kwargs else None)
-                        else:
-                            # Regular member access
-                            expr = MemberAccess(expr, member)
+                        # Regular member access
+                        expr = MemberAccess(expr, member)
 
                 return expr
             else:
                 return Identifier(name)
         raise SyntaxError(f"Unexpected token {token.type} at line {token.line}")
 
+    def _parse_comma_list(self, parse_item, terminator: TokenType) -> list:
+        """Parse comma-separated items up to and including the terminator token"""
+        items = []
+        types = self.types
+        while types[self.pos] != terminator:
+            items.append(parse_item())
+            if types[self.pos] == TokenType.COMMA:
+                self.pos += 1
+        self.expect(terminator)
+        return items
+
+    def parse_call_args(self) -> Tuple[List[Expression], Optional[List[KeywordArg]]]:
+        """Parse a call's arguments, after its '(', as (positional, keyword or None)"""
+        items = self._parse_comma_list(self.parse_argument, TokenType.RPAREN)
+        args = [item for item in items if type(item) is not KeywordArg]
+        if len(args) == len(items):
+            return args, None
+        return args, [item for item in items if type(item) is KeywordArg]
+
+    def parse_argument(self) -> Expression:
+        """Parse one call argument: a keyword argument (name=value) or an expression"""
+        if self.types[self.pos] == TokenType.IDENTIFIER and self.types[self.pos + 1] == TokenType.ASSIGN:
+            kw_name = self.tokens[self.pos].value
+            self.pos += 1
+            self.pos += 1  # consume =
+            return KeywordArg(kw_name, self.parse_expression())
+        return self.parse_expression()
+
     def parse_list(self) -> ListLiteral:
         self.expect(TokenType.LBRACKET)
         elements = []
@@ -850,17 +840,17 @@ class Parser:
         # Skip any newlines after opening bracket
         self.skip_newlines()
 
-        if self.current_token().type != TokenType.RBRACKET:
+        if self.types[self.pos] != TokenType.RBRACKET:
             elements.append(self.parse_expression())
 
             while True:
                 self.skip_newlines()
-                if self.current_token().type != TokenType.COMMA:
+                if self.types[self.pos] != TokenType.COMMA:
                     break
-                self.advance()  # consume comma
+                self.pos += 1  # consume comma
                 self.skip_newlines()
 
-                if self.current_token().type == TokenType.RBRACKET:
+                if self.types[self.pos] == TokenType.RBRACKET:
                     break  # trailing comma
 
                 elements.append(self.parse_expression())
@@ -877,7 +867,7 @@ class Parser:
         # Skip any newlines after opening brace
         self.skip_newlines()
 
-        if self.current_token().type != TokenType.RBRACE:
+        if self.types[self.pos] != TokenType.RBRACE:
             # Parse first key-value pair
             key = self.parse_expression()
             self.skip_newlines()
@@ -890,12 +880,12 @@ class Parser:
             # Parse remaining key-value pairs
             while True:
                 self.skip_newlines()
-                if self.current_token().type != TokenType.COMMA:
+                if self.types[self.pos] != TokenType.COMMA:
                     break
-                self.advance()  # consume comma
+                self.pos += 1  # consume comma
                 self.skip_newlines()
 
-                if self.current_token().type == TokenType.RBRACE:
+                if self.types[self.pos] == TokenType.RBRACE:
                     break  # trailing comma
 
                 key = self.parse_expression()
@@ -908,4 +898,18 @@ class Parser:
 
         self.skip_newlines()
         self.expect(TokenType.RBRACE)
-        return DictLiteral(keys, values)
\ No newline at end of file
+        return DictLiteral(keys, values)
+
+# Top-level item parsers keyed by the item's first token
+TOP_LEVEL_PARSERS = {
+    TokenType.MAIN: Parser.parse_main_block,
+    TokenType.OS: Parser.parse_block,
+    TokenType.DE: Parser.parse_block,
+    TokenType.FO: Parser.parse_block,
+    TokenType.PARALLEL: Parser.parse_block,
+    TokenType.DEF: Parser.parse_function,
+    TokenType.CLASS: Parser.parse_class,
+    TokenType.IMPORT: Parser.parse_import,
+    TokenType.FROM: Parser.parse_from_import,
+    TokenType.IDENTIFIER: Parser.parse_top_level_identifier,
+}
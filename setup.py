@@ -14,6 +14,17 @@ def read_readme():
     except FileNotFoundError:
         return "WHEN Language Interpreter - A unique loop-based programming language"
 
+# Optional: build the compiled-code runner (compiler.py) and the front end
+# (lexer.py, parser.py) as C extensions with Cython. Enabled with
+# WHEN_CYTHON=1; the pure Python modules are used otherwise, and whenever
+# an extension is not present.
+def cython_extensions():
+    if not os.environ.get("WHEN_CYTHON"):
+        return []
+    from Cython.Build import cythonize
+    return cythonize(["compiler.py", "lexer.py", "parser.py"],
+                     compiler_directives={"language_level": "3"})
+
 setup(
     name="when-lang",
     version="0.4.0",
@@ -29,8 +40,10 @@ setup(
         "parser",
         "interpreter",
         "ast_nodes",
+        "compiler",
         "whenloop"
     ],
+    ext_modules=cython_extensions(),
     entry_points={
         "console_scripts": [
             "when=when:main",
@@ -60,5 +73,11 @@ setup(
             "black",
             "flake8",
         ],
+        "watch": [
+            "watchdog",
+        ],
+        "jit": [
+            "numba",
+        ],
     },
 )
\ No newline at end of file
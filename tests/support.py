@@ -0,0 +1,35 @@
+"""Helpers for running WHEN source from the tests"""
+import contextlib
+import io
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from lexer import Lexer
+from parser import Parser
+from interpreter import Interpreter
+
+
+def parse(source):
+    return Parser(Lexer(source).tokenize()).parse()
+
+
+def run_program(program, **global_vars):
+    """Interpret a parsed program, returning what it printed.
+
+    Keyword arguments are bound as global variables first, so tests can
+    hand Python objects to the WHEN code.
+    """
+    interpreter = Interpreter()
+    interpreter.global_vars.update(global_vars)
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        interpreter.interpret(program)
+    return output.getvalue()
+
+
+def run_source(source, **global_vars):
+    return run_program(parse(source), **global_vars)
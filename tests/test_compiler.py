@@ -0,0 +1,99 @@
+import unittest
+
+from tests.support import parse, run_source
+from ast_nodes import BinaryOp, NumberLiteral, StringLiteral, UnaryOp
+from compiler import MAX_FOLDED_LENGTH, fold, fold_constants, is_passive, is_pure, make_literal
+
+
+def binary(left, operator, right):
+    return BinaryOp(left, operator, right)
+
+
+class FoldTests(unittest.TestCase):
+    def test_folds_constant_arithmetic(self):
+        folded = fold(binary(NumberLiteral(2), '+', NumberLiteral(3)))
+        self.assertEqual(folded, NumberLiteral(5))
+
+    def test_folds_short_string_repeat(self):
+        folded = fold(binary(StringLiteral('ab'), '*', NumberLiteral(3)))
+        self.assertEqual(folded, StringLiteral('ababab'))
+
+    def test_leaves_erroring_expressions_alone(self):
+        for expr in (
+            binary(NumberLiteral(1), '/', NumberLiteral(0)),
+            binary(NumberLiteral(1), '%', NumberLiteral(0)),
+            binary(StringLiteral('a'), '+', NumberLiteral(1)),
+            binary(StringLiteral('a'), '-', StringLiteral('b')),
+            UnaryOp('-', StringLiteral('a')),
+        ):
+            with self.subTest(expr=expr):
+                self.assertIs(fold(expr), expr)
+
+    def test_leaves_identity_comparisons_alone(self):
+        expr = binary(NumberLiteral(1), 'is', NumberLiteral(1))
+        self.assertIs(fold(expr), expr)
+
+    def test_does_not_build_large_strings(self):
+        for expr in (
+            binary(StringLiteral('ab'), '*', NumberLiteral(300000000)),
+            binary(NumberLiteral(300000000), '*', StringLiteral('ab')),
+            binary(StringLiteral('x' * MAX_FOLDED_LENGTH), '+', StringLiteral('x')),
+        ):
+            with self.subTest(operator=expr.operator):
+                self.assertIs(fold(expr), expr)
+        self.assertIsNone(make_literal('x' * (MAX_FOLDED_LENGTH + 1)))
+
+    def test_unexecuted_branch_keeps_its_expression(self):
+        program = parse('main:\n    when False:\n        s = "ab" * 300000000\n    exit()\n')
+        assignment = program.main.body[0].body[0]
+        fold_constants(assignment)
+        self.assertIs(type(assignment.value), BinaryOp)
+
+    def test_folded_program_output(self):
+        output = run_source('''
+main:
+    print(2 * 3 + 1, "a" + "b", not True, -(4), 7 // 2, "x" * 3)
+    exit()
+''')
+        self.assertEqual(output.splitlines()[0], '7 ab False -4 3 xxx')
+
+    def test_constant_ternary(self):
+        output = run_source('main:\n    print("y" when True else "n")\n    exit()\n')
+        self.assertEqual(output.splitlines()[0], 'y')
+
+
+def condition(source):
+    return parse(f'main:\n    when {source}:\n        pass\n').main.body[0].condition
+
+
+class PurityTests(unittest.TestCase):
+    def test_reads_are_pure(self):
+        self.assertTrue(is_pure(condition('a + 1 > b and not c')))
+
+    def test_calls_are_not_pure(self):
+        self.assertFalse(is_pure(condition('f(a) > 1')))
+        self.assertFalse(is_pure(condition('a.pop() > 1')))
+
+    def test_member_access_is_pure_only_on_blocks(self):
+        expr = condition('go.status == "COMPLETED"')
+        self.assertTrue(is_pure(expr, {'go'}))
+        self.assertFalse(is_pure(expr))
+        self.assertFalse(is_pure(condition('obj.value > 1'), {'go'}))
+
+    def test_passive_main(self):
+        program = parse('''
+de go(1):
+    pass
+main:
+    when go.status == "STOPPED":
+        go.start()
+    when obj.ready:
+        exit()
+''')
+        body = program.main.body
+        self.assertTrue(is_passive(body[:1], {'go'}))
+        self.assertFalse(is_passive(body, {'go'}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+"""Run the example programs and compare their output with recorded runs"""
+import os
+import subprocess
+import sys
+import unittest
+
+from tests.support import ROOT
+
+EXAMPLES = os.path.join(ROOT, 'examples')
+EXPECTED = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'expected')
+
+
+def run_example(name):
+    result = subprocess.run(
+        [sys.executable, os.path.join(ROOT, 'when.py'), name + '.when'],
+        cwd=EXAMPLES, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT, universal_newlines=True, timeout=60)
+    return result.returncode, result.stdout
+
+
+class ExampleTests(unittest.TestCase):
+    def test_examples(self):
+        for filename in sorted(os.listdir(EXPECTED)):
+            name = os.path.splitext(filename)[0]
+            with self.subTest(example=name):
+                with open(os.path.join(EXPECTED, filename)) as f:
+                    expected = f.read()
+                returncode, output = run_example(name)
+                self.assertEqual(returncode, 0)
+                self.assertEqual(output, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import contextlib
+import io
+import time
+import unittest
+
+from tests.support import parse, run_source
+from compiler import compile_kernel
+
+
+def kernel_for(body):
+    program = parse('de go(1):\n' + ''.join(f'    {line}\n' for line in body) + 'main:\n    exit()\n')
+    return compile_kernel(program.blocks[0].body)
+
+
+# Adds y to x three times, then prints x
+COUNTING = '''
+de go(3):
+    x = x + y
+main:
+    when go.status == "STOPPED":
+        go.start()
+    when go.status == "COMPLETED":
+        print(x)
+        exit()
+'''
+
+
+# Stops a long process=True block shortly after starting it
+STOPPED_IN_PROCESS = '''
+parallel de work(200000000, process=True):
+    a = a + 1
+main:
+    when work.status == "STOPPED":
+        work.start()
+    sleep(0.3)
+    work.stop()
+    print(a > 0, a == work.current_iteration)
+    exit()
+'''
+
+# Divides by zero partway through a process=True block
+FAILING_IN_PROCESS = '''
+parallel de work(250000, process=True, tick=0):
+    a = a + 1
+    b = b - 1
+    c = a / b
+main:
+    when work.status == "STOPPED":
+        work.start()
+    when work.status == "COMPLETED":
+        print(a, b, work.current_iteration)
+        exit()
+'''
+
+
+class NumericKernelTests(unittest.TestCase):
+    def test_runs_numeric_body(self):
+        kernel = kernel_for(['a = b * 2 + 1', 'b = a // 2'])
+        variables = {'b': 3}
+        self.assertTrue(kernel.run(variables))
+        self.assertEqual(variables, {'a': 7, 'b': 3})
+
+    def test_only_numeric_bodies_compile(self):
+        self.assertIsNone(kernel_for(['a = "x"']))
+        self.assertIsNone(kernel_for(['print(a)']))
+        self.assertIsNone(kernel_for(['a = f(b)']))
+
+    def test_falls_back_on_non_numeric_inputs(self):
+        kernel = kernel_for(['a = b + c'])
+        for variables in ({'b': 'x', 'c': 'y'}, {'b': 1, 'c': None},
+                          {'b': [1], 'c': [2]}, {'b': 1}):
+            with self.subTest(variables=variables):
+                before = dict(variables)
+                self.assertFalse(kernel.run(variables))
+                self.assertEqual(variables, before)
+
+    def test_falls_back_without_partial_writes(self):
+        kernel = kernel_for(['a = b + 1', 'c = b / 0'])
+        variables = {'b': 1}
+        self.assertFalse(kernel.run(variables))
+        self.assertEqual(variables, {'b': 1})
+
+    def test_interpreter_runs_numeric_block(self):
+        self.assertEqual(run_source(COUNTING, x=1, y=2).splitlines()[0], '7')
+
+    def test_interpreter_falls_back_on_strings(self):
+        self.assertEqual(run_source(COUNTING, x='a', y='b').splitlines()[0], 'abbb')
+
+
+    def test_process_block_stops_between_chunks(self):
+        started = time.monotonic()
+        output = run_source(STOPPED_IN_PROCESS, a=0)
+        self.assertLess(time.monotonic() - started, 10)
+        self.assertEqual(output.splitlines()[0], 'True True')
+
+    def test_process_block_falls_back_on_error(self):
+        # The interpreted body's traceback goes to stderr
+        with contextlib.redirect_stderr(io.StringIO()):
+            output = run_source(FAILING_IN_PROCESS, a=0, b=150000)
+        self.assertIn('[PARALLEL] Error in work: division by zero', output)
+        self.assertEqual(output.splitlines()[-2], '150000 0 149999')
+
+
+if __name__ == '__main__':
+    unittest.main()
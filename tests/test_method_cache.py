@@ -0,0 +1,84 @@
+import unittest
+
+from tests.support import parse, run_program
+from ast_nodes import MethodCall
+from compiler import walk
+
+
+class Slotted:
+    __slots__ = ('v',)
+
+    def __init__(self, v):
+        self.v = v
+
+    @staticmethod
+    def double(x):
+        return x * 2
+
+    @classmethod
+    def name(cls):
+        return cls.__name__
+
+    def get(self):
+        return self.v
+
+
+# The call site runs once per iteration, so later iterations take the cache
+REPEATED_CALL = '''
+de go(3):
+    print(obj.{call})
+main:
+    when go.status == "STOPPED":
+        go.start()
+    when go.status == "COMPLETED":
+        exit()
+'''
+
+
+def method_calls(program):
+    return [node for node in walk(program.blocks[0]) if type(node) is MethodCall]
+
+
+class MethodCallCacheTests(unittest.TestCase):
+    def run_repeated(self, call, obj):
+        program = parse(REPEATED_CALL.format(call=call))
+        output = run_program(program, obj=obj)
+        return output.splitlines()[:3], method_calls(program)[0]
+
+    def test_staticmethod_on_slotted_object(self):
+        lines, call = self.run_repeated('double(5)', Slotted(1))
+        self.assertEqual(lines, ['10'] * 3)
+        self.assertIsNone(call._cached_func)
+
+    def test_classmethod_on_slotted_object(self):
+        lines, call = self.run_repeated('name()', Slotted(1))
+        self.assertEqual(lines, ['Slotted'] * 3)
+        self.assertIsNone(call._cached_func)
+
+    def test_plain_method_is_cached(self):
+        lines, call = self.run_repeated('get()', Slotted(7))
+        self.assertEqual(lines, ['7'] * 3)
+        self.assertIs(call._cached_func, Slotted.get)
+
+    def test_builtin_method_is_cached(self):
+        lines, call = self.run_repeated('upper()', 'ab')
+        self.assertEqual(lines, ['AB'] * 3)
+        self.assertIs(call._cached_type, str)
+
+    def test_receiver_type_change(self):
+        program = parse('''
+values = ["ab", [1, 2], "cd", (3,), "ef"]
+de go(5):
+    print(values[go.current_iteration].index(values[go.current_iteration][0]))
+main:
+    when go.status == "STOPPED":
+        go.start()
+    when go.status == "COMPLETED":
+        exit()
+''')
+        output = run_program(program)
+        self.assertEqual(output.splitlines()[:5], ['0'] * 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+from unittest import mock
+
+import interpreter
+from tests.support import run_source
+
+
+# Starts more forever blocks than the patched pool has threads, then a
+# counted block that can only finish if it gets a thread of its own
+SATURATED = '''
+parallel fo spin_a(tick=0.01):
+    pass
+parallel fo spin_b(tick=0.01):
+    pass
+parallel de last(3, tick=0):
+    count = count + 1
+main:
+    when spin_a.status == "STOPPED":
+        spin_a.start()
+        spin_b.start()
+        last.start()
+    when last.status == "COMPLETED":
+        print(count)
+        spin_a.stop()
+        spin_b.stop()
+        exit()
+'''
+
+
+class ParallelPoolTests(unittest.TestCase):
+    def test_block_starts_when_pool_is_full(self):
+        with mock.patch.object(interpreter, 'PARALLEL_WORKERS', 2):
+            output = run_source(SATURATED, count=0)
+        self.assertEqual(output.splitlines()[0], '3')
+
+
+if __name__ == '__main__':
+    unittest.main()
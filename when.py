@@ -7,6 +7,7 @@ Usage:
     when <filename.when>     - Run a WHEN program
     when -i                  - Interactive REPL mode
     when --hot-reload <filename.when> - Run with hot reload enabled
+    when --jit <filename.when> - Compile numeric blocks with numba (if installed)
     when --version          - Show version
     when --help             - Show this help
 """
@@ -32,7 +33,7 @@ def show_version():
     print(f"WHEN Language Interpreter v{__version__}")
     print("Built on Python", sys.version)
 
-def run_file(filename: str, hot_reload: bool = False):
+def run_file(filename: str, hot_reload: bool = False, jit: bool = False):
     """Run a WHEN program from a file"""
     try:
         if not os.path.exists(filename):
@@ -54,7 +55,7 @@ def run_file(filename: str, hot_reload: bool = False):
         ast = parser.parse()
 
         # Interpret with hot reload if enabled
-        interpreter = Interpreter(enable_hot_reload=hot_reload, source_file=filename)
+        interpreter = Interpreter(enable_hot_reload=hot_reload, source_file=filename, jit=jit)
         interpreter.interpret(ast)
 
     except FileNotFoundError:
@@ -120,6 +121,17 @@ def main():
         show_help()
         return
 
+    # --jit combines with the other run modes, so take it out first
+    jit = '--jit' in sys.argv
+    if jit:
+        sys.argv.remove('--jit')
+        from compiler import njit
+        if njit is None:
+            print("Warning: --jit needs numba (pip install numba); ignoring --jit")
+        if len(sys.argv) == 1:
+            print("Error: --jit requires a filename")
+            sys.exit(1)
+
     arg = sys.argv[1]
 
     if arg in ['-h', '--help']:
@@ -133,14 +145,14 @@ def main():
             print("Error: --hot-reload requires a filename")
             print("Usage: when --hot-reload <filename.when>")
             sys.exit(1)
-        run_file(sys.argv[2], hot_reload=True)
+        run_file(sys.argv[2], hot_reload=True, jit=jit)
     elif arg.startswith('-'):
         print(f"Unknown option: {arg}")
         print("Use 'when --help' for usage information")
         sys.exit(1)
     else:
         # Assume it's a filename
-        run_file(arg)
+        run_file(arg, jit=jit)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file